@@ -0,0 +1,19 @@
+import os
+
+from setuptools import setup
+
+ext_modules = []
+if os.environ.get("POLYMARKET_BOT_MYPYC") == "1":
+    from mypyc.build import mypycify
+
+    os.environ.setdefault("MYPYPATH", "src")
+    ext_modules = mypycify(
+        [
+            "--explicit-package-bases",
+            "--ignore-missing-imports",
+            "--follow-imports=silent",
+            "src/strategy/state_machine.py",
+        ]
+    )
+
+setup(ext_modules=ext_modules)
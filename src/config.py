@@ -47,6 +47,14 @@ JURISDICTION_BANNED_CATEGORIES: dict[str, tuple[str, ...]] = {
 }
 
 
+def banned_categories_for_jurisdiction(jurisdiction_key: str) -> frozenset[str]:
+    categories = (
+        *JURISDICTION_BANNED_CATEGORIES.get("default", tuple()),
+        *JURISDICTION_BANNED_CATEGORIES.get(jurisdiction_key, tuple()),
+    )
+    return frozenset(c.strip().lower() for c in categories if c.strip())
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
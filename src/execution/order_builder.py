@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import time
 from dataclasses import dataclass
 from typing import Any
@@ -8,6 +7,7 @@ from urllib.error import URLError
 from urllib.parse import urlencode
 from urllib.request import urlopen
 
+import orjson
 import structlog
 from py_clob_client.clob_types import OrderArgs
 
@@ -50,7 +50,7 @@ def fetch_fee_rate(token_id: str) -> float:
     url = f"{_FEE_RATE_BASE_URL}/fee-rate?{query}"
     try:
         with urlopen(url, timeout=5.0) as response:  # noqa: S310
-            payload = json.loads(response.read().decode("utf-8"))
+            payload = orjson.loads(response.read())
     except (OSError, URLError, TimeoutError, ValueError) as exc:
         BOT_FEE_FETCH_FAILURES_TOTAL.inc()
         raise RuntimeError("fee_rate_fetch_failed") from exc
@@ -5,13 +5,13 @@ import contextlib
 import time
 from dataclasses import dataclass
 from urllib.parse import urlparse
-from typing import AsyncIterator
+from typing import AsyncIterator, Iterable
 
 import orjson
 import structlog
 import websockets
 
-from metrics import CLOB_DROPPED_MESSAGES, CLOB_PRICE_CHANGE_PARSED
+from metrics import CLOB_DROPPED_MESSAGES, clob_price_change_parsed
 from utils.time import normalize_ts
 
 logger = structlog.get_logger(__name__)
@@ -353,7 +353,7 @@ class CLOBWebSocket:
                             last_trade_size=last_trade_size,
                         )
                     )
-                    CLOB_PRICE_CHANGE_PARSED.labels(schema="new").inc()
+                    clob_price_change_parsed("new").inc()
                     last_update[0] = time.time()
                 return tops
 
@@ -389,7 +389,7 @@ class CLOBWebSocket:
 
                 ts = normalize_ts(change.get("timestamp", outer_ts))
                 last_update[0] = time.time()
-                CLOB_PRICE_CHANGE_PARSED.labels(schema="legacy").inc()
+                clob_price_change_parsed("legacy").inc()
 
                 if bid is None and ask is None:
                     top = self._apply_legacy_level_update(
@@ -449,20 +449,23 @@ class CLOBWebSocket:
         return self._subscription_cache_payload if self._subscription_cache_payload is not None else b""
 
 
-    async def stream_books(self, token_ids: list[str]) -> AsyncIterator[BookTop]:
+    async def stream_books(self, token_ids: Iterable[str]) -> AsyncIterator[BookTop]:
         backoff = self.reconnect_delay_min
+        # Materialize once; reconnects reuse the same list and cached subscription bytes.
+        token_list = list(token_ids)
+        token_set = set(token_list)
+        sub = self._build_subscription_payload(token_set)
 
         while True:
             failed_pings = [0]
             try:
                 async with websockets.connect(self.ws_url, ping_interval=None, ping_timeout=None) as ws:
                     self._ws = ws
-                    self._subscribed_token_ids = set(token_ids)
-                    sub = {"assets_ids": token_ids, "type": "market"}
-                    await ws.send(orjson.dumps(sub))
+                    self._subscribed_token_ids = token_set
+                    await ws.send(sub)
                     hb_task = asyncio.create_task(self._heartbeat(ws, failed_pings))
                     last_update = [time.time()]
-                    stale_task = asyncio.create_task(self._stale_watchdog(last_update, token_ids, "book"))
+                    stale_task = asyncio.create_task(self._stale_watchdog(last_update, token_list, "book"))
 
                     try:
                         while True:
@@ -7,7 +7,7 @@ from collections.abc import AsyncIterator, Awaitable, Callable
 
 import structlog
 
-from config import Settings
+from config import Settings, banned_categories_for_jurisdiction
 from execution.heartbeat_monitor import HeartbeatMonitor
 from execution.trader import Trader
 from geo import check_geoblock, resolve_jurisdiction_key
@@ -21,8 +21,6 @@ from markets.gamma_cache import GammaCache, UpDownMarket
 from markets.token_metadata_cache import TokenMetadata, TokenMetadataCache
 from ops.recorder import EventRecorder
 from metrics import (
-    FEED_LAG_SECONDS,
-    FEED_MODE,
     HAMMER_ATTEMPTED,
     HAMMER_FILLED,
     KILL_SWITCH_ACTIVE,
@@ -31,6 +29,8 @@ from metrics import (
     RECOVERY_STABILIZATION_ACTIVE,
     STALE_FEED,
     TRADING_ALLOWED,
+    feed_lag_seconds,
+    feed_mode,
     start_metrics_server,
 )
 from strategy.calibration import load_probability_calibrator
@@ -84,7 +84,7 @@ def update_quorum_metrics(decision: QuorumDecision, *, geoblock_trading_allowed:
         if decision.divergence_pct is not None:
             ORACLE_SPOT_DIVERGENCE_PCT.set(decision.divergence_pct)
     for feed in ("chainlink", "binance", "coinbase"):
-        FEED_LAG_SECONDS.labels(feed=feed).set(decision.feed_lag_seconds.get(feed, 0.0))
+        feed_lag_seconds(feed).set(decision.feed_lag_seconds.get(feed, 0.0))
 
 
 def recovery_window_satisfied(
@@ -104,8 +104,8 @@ def recovery_window_satisfied(
 def enter_monitor_only_mode(strategy: StrategyStateMachine, feed_state: dict[str, object], now: float) -> None:
     feed_state["mode"] = "fallback"
     set_execution_mode(ExecutionMode.MONITOR_ONLY)
-    FEED_MODE.labels(mode="rtds").set(0)
-    FEED_MODE.labels(mode="fallback").set(1)
+    feed_mode("rtds").set(0)
+    feed_mode("fallback").set(1)
     RECOVERY_STABILIZATION_ACTIVE.set(0)
     strategy.disable_watch_mode(int(now))
 
@@ -191,16 +191,20 @@ async def stream_clob_with_resubscribe(
 ) -> AsyncIterator[BookTop]:
     """Yield book tops and re-subscribe when token ids roll to a new epoch."""
     while True:
-        snapshot = tuple(sorted(get_token_ids()))
+        snapshot = frozenset(get_token_ids())
         if not snapshot:
             await asyncio.sleep(idle_sleep_seconds)
             continue
 
-        async for top in clob.stream_books(list(snapshot)):
+        async for top in clob.stream_books(sorted(snapshot)):
             yield top
-            current = tuple(sorted(get_token_ids()))
+            current = get_token_ids()
             if current != snapshot:
-                logger.info("clob_token_set_changed_resubscribing", previous=snapshot, current=current)
+                logger.info(
+                    "clob_token_set_changed_resubscribing",
+                    previous=tuple(sorted(snapshot)),
+                    current=tuple(sorted(current)),
+                )
                 break
 
 
@@ -215,8 +219,7 @@ async def orchestrate() -> None:
     )
     start_metrics_server(settings.metrics_host, settings.metrics_port)
     geoblock_trading_allowed, _country, _region, jurisdiction_key = await run_startup_geoblock_preflight(settings)
-    banned_categories = set(JURISDICTION_BANNED_CATEGORIES.get("default", tuple()))
-    banned_categories.update(JURISDICTION_BANNED_CATEGORIES.get(jurisdiction_key, tuple()))
+    banned_categories = banned_categories_for_jurisdiction(jurisdiction_key)
 
     gamma = GammaCache(str(settings.gamma_api_url))
     rtds = RTDSFeed(
@@ -302,6 +305,7 @@ async def orchestrate() -> None:
 
     market_state: dict[str, UpDownMarket] = {}
     token_ids: set[str] = set()
+    token_ids_view: tuple[str, ...] = ()
     clob_resubscribe_event = asyncio.Event()
     token_change_reason = "initial_bootstrap"
     last_token_change_at = 0.0
@@ -317,7 +321,7 @@ async def orchestrate() -> None:
                 return
 
     async def refresh_markets(now_ts: int) -> None:
-        nonlocal market_state, token_ids, token_change_reason, last_token_change_at
+        nonlocal market_state, token_ids, token_ids_view, token_change_reason, last_token_change_at
         s5 = current_start_epoch(now_ts, 300)
         s15 = current_start_epoch(now_ts, 900)
         n5 = s5 + 300
@@ -374,8 +378,13 @@ async def orchestrate() -> None:
                 debounce_seconds=clob_resubscribe_debounce_seconds,
             )
             token_ids = new_token_ids
+            token_ids_view = tuple(sorted(new_token_ids))
             clob_resubscribe_event.set()
 
+        # Next buckets were fetched above; warm the ones after so the boundary roll is a cache hit.
+        gamma.prefetch(5, [n5 + 300])
+        gamma.prefetch(15, [n15 + 900])
+
     last_refresh_ts = int(time.time())
     await refresh_markets(last_refresh_ts)
     clob = CLOBWebSocket(
@@ -437,7 +446,7 @@ async def orchestrate() -> None:
         if not strategy.watch_mode:
             return
 
-        best = strategy.pick_best(now, list(market_state.values()), {})
+        best = strategy.pick_best(now, market_state.values(), {})
         if best and best.ev > 0:
             recorder.record(
                 "decision",
@@ -525,8 +534,8 @@ async def orchestrate() -> None:
         "fresh_rtds_updates": 0,
     }
     set_execution_mode(ExecutionMode.LIVE_TRADING)
-    FEED_MODE.labels(mode="rtds").set(1)
-    FEED_MODE.labels(mode="fallback").set(0)
+    feed_mode("rtds").set(1)
+    feed_mode("fallback").set(0)
     RECOVERY_STABILIZATION_ACTIVE.set(0)
     TRADING_ALLOWED.set(0)
     KILL_SWITCH_ACTIVE.set(1)
@@ -621,8 +630,8 @@ async def orchestrate() -> None:
                 feed_state["fresh_rtds_updates"] = 0
                 RECOVERY_STABILIZATION_ACTIVE.set(0)
                 set_execution_mode(ExecutionMode.LIVE_TRADING)
-                FEED_MODE.labels(mode="rtds").set(1)
-                FEED_MODE.labels(mode="fallback").set(0)
+                feed_mode("rtds").set(1)
+                feed_mode("fallback").set(0)
                 logger.info("recovered_rtds_freshness", staleness_seconds=age, stabilization_window_seconds=stabilization_window_seconds)
                 if fallback_task and not fallback_task.done():
                     fallback_task.cancel()
@@ -634,11 +643,11 @@ async def orchestrate() -> None:
         nonlocal token_change_reason
         subscribe_reason = "initial_bootstrap"
         while True:
-            if not token_ids:
+            if not token_ids_view:
                 await asyncio.sleep(1)
                 continue
 
-            subscribed_tokens = sorted(token_ids)
+            subscribed_tokens = token_ids_view
             logger.info(
                 "clob_subscribe",
                 reason=subscribe_reason,
@@ -660,23 +669,24 @@ async def orchestrate() -> None:
                     with contextlib.suppress(asyncio.CancelledError):
                         await resubscribe_task
                     top = next_book_task.result()
-                    bids_levels = [{"price": top.best_bid, "size": top.best_bid_size}] if top.best_bid is not None else []
-                    asks_levels = [{"price": top.best_ask, "size": top.best_ask_size}] if top.best_ask is not None else []
-                    recorder.record(
-                        "clob_book",
-                        ts=top.ts,
-                        token_id=top.token_id,
-                        bids_levels=bids_levels,
-                        asks_levels=asks_levels,
-                    )
-                    recorder.record(
-                        "clob_price_change",
-                        ts=top.ts,
-                        token_id=top.token_id,
-                        best_bid=top.best_bid,
-                        best_ask=top.best_ask,
-                        schema_version=1,
-                    )
+                    if recorder.enabled:
+                        bids_levels = [{"price": top.best_bid, "size": top.best_bid_size}] if top.best_bid is not None else []
+                        asks_levels = [{"price": top.best_ask, "size": top.best_ask_size}] if top.best_ask is not None else []
+                        recorder.record(
+                            "clob_book",
+                            ts=top.ts,
+                            token_id=top.token_id,
+                            bids_levels=bids_levels,
+                            asks_levels=asks_levels,
+                        )
+                        recorder.record(
+                            "clob_price_change",
+                            ts=top.ts,
+                            token_id=top.token_id,
+                            best_bid=top.best_bid,
+                            best_ask=top.best_ask,
+                            schema_version=1,
+                        )
                     strategy.on_book(
                         top.token_id,
                         top.best_bid,
@@ -703,13 +713,12 @@ async def orchestrate() -> None:
                 clob_resubscribe_event.clear()
                 await wait_for_token_set_to_stabilize()
                 subscribe_reason = token_change_reason
-                updated_tokens = sorted(token_ids)
                 logger.info(
                     "clob_resubscribe_triggered",
                     reason=subscribe_reason,
                     debounce_seconds=clob_resubscribe_debounce_seconds,
-                    token_count=len(updated_tokens),
-                    token_ids=updated_tokens,
+                    token_count=len(token_ids_view),
+                    token_ids=token_ids_view,
                 )
                 break
 
@@ -95,8 +95,9 @@ class FeeRateCache:
 
         now = time.time()
         fetched = await asyncio.gather(*[self._fetch_fee_rate_bps(token_id) for token_id in cold_tokens])
-        for token_id, fee_rate_bps in zip(cold_tokens, fetched, strict=True):
-            self._cache[token_id] = _FeeRateEntry(fee_rate_bps=fee_rate_bps, updated_at=now)
+        self._cache.update(
+            {token_id: _FeeRateEntry(fee_rate_bps, now) for token_id, fee_rate_bps in zip(cold_tokens, fetched, strict=True)}
+        )
 
     def get_fee_rate_bps(self, token_id: str) -> float | None:
         if not self._is_fresh(token_id):
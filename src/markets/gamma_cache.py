@@ -1,18 +1,34 @@
 from __future__ import annotations
 
 import asyncio
-import json
+import calendar
 import re
 import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
+from datetime import datetime
 
 import aiohttp
+import orjson
 import structlog
 
 from markets.token_metadata_cache import TokenMetadata
 
 logger = structlog.get_logger(__name__)
 
+_HIT_LOG_EVERY = 64
+_WARM_CONCURRENCY = 8
+_SLUG_RE = re.compile(r"^btc-updown-(5|15)m-(\d+)$")
+_ISO_UTC_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.\d+)?(?:Z|\+00:00)$")
+
+
+def _parse_iso_epoch(value: str) -> int:
+    m = _ISO_UTC_RE.match(value)
+    if m is None:
+        return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp())
+    year, month, day, hour, minute, second = map(int, m.groups())
+    return calendar.timegm((year, month, day, hour, minute, second, 0, 0, 0))
+
 
 @dataclass(slots=True)
 class UpDownMarket:
@@ -25,25 +41,43 @@ class UpDownMarket:
     category: str = "event"
     token_metadata_by_id: dict[str, TokenMetadata] = field(default_factory=dict)
 
+    def __post_init__(self) -> None:
+        self.category = self.category.strip().lower()
+
+
+class _FetchAbandoned(RuntimeError):
+    pass
+
 
 def build_slug(horizon_minutes: int, start_epoch: int) -> str:
     return f"btc-updown-{horizon_minutes}m-{start_epoch}"
 
 
 class GammaCache:
-    def __init__(self, base_url: str) -> None:
+    def __init__(self, base_url: str, *, max_entries: int = 1024) -> None:
         self.base_url = base_url.rstrip("/")
-        self._cache: dict[str, tuple[UpDownMarket, int]] = {}
+        self.max_entries = max(1, max_entries)
+        self._cache: OrderedDict[str, tuple[UpDownMarket, int]] = OrderedDict()
         self._hits = 0
         self._misses = 0
+        self._inflight: dict[str, asyncio.Future[UpDownMarket]] = {}
+        self._prefetch_tasks: set[asyncio.Task[None]] = set()
+        self._prefetch_attempted: set[tuple[int, int]] = set()
         self._session: aiohttp.ClientSession | None = None
 
     async def _get_session(self) -> aiohttp.ClientSession:
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=10),
+            )
         return self._session
 
     async def close(self) -> None:
+        for task in list(self._prefetch_tasks):
+            task.cancel()
+        if self._prefetch_tasks:
+            await asyncio.gather(*self._prefetch_tasks, return_exceptions=True)
         if self._session is not None and not self._session.closed:
             await self._session.close()
         self._session = None
@@ -64,9 +98,8 @@ class GammaCache:
     def _validate_market_row(
         row: dict[str, object], slug: str, horizon_minutes: int, start_epoch: int
     ) -> tuple[int, int]:
-        pattern = r"^btc-updown-(5|15)m-(\d+)$"
         row_slug = str(row.get("slug", ""))
-        m = re.match(pattern, row_slug)
+        m = _SLUG_RE.match(row_slug)
         if not m or row_slug != slug:
             raise ValueError(f"Invalid market slug. expected={slug} got={row_slug}")
 
@@ -78,10 +111,8 @@ class GammaCache:
         if not start_iso or not end_iso:
             raise ValueError("Missing start/end time from Gamma")
 
-        from datetime import datetime
-
-        start = int(datetime.fromisoformat(str(start_iso).replace("Z", "+00:00")).timestamp())
-        end = int(datetime.fromisoformat(str(end_iso).replace("Z", "+00:00")).timestamp())
+        start = _parse_iso_epoch(str(start_iso))
+        end = _parse_iso_epoch(str(end_iso))
 
         if start != start_epoch:
             logger.warning(
@@ -98,9 +129,8 @@ class GammaCache:
         if bool(row.get("closed")) or bool(row.get("resolved")):
             raise ValueError("market not active")
 
-        question = str(row.get("question", "")).lower()
-        desc = str(row.get("description", "")).lower()
-        if "btc" not in question + desc or "usd" not in question + desc:
+        text = (str(row.get("question", "")) + str(row.get("description", ""))).lower()
+        if "btc" not in text or "usd" not in text:
             raise ValueError("underlying is not BTC/USD")
 
         return start, end
@@ -146,11 +176,14 @@ class GammaCache:
         return "event"
 
     @staticmethod
-    def filter_markets_by_banned_categories(markets: list[UpDownMarket], banned_categories: set[str]) -> list[UpDownMarket]:
+    def filter_markets_by_banned_categories(
+        markets: list[UpDownMarket], banned_categories: frozenset[str] | set[str]
+    ) -> list[UpDownMarket]:
+        # Both sides are normalized up front: UpDownMarket lowercases its category and
+        # banned_categories_for_jurisdiction() lowercases the banned set.
         if not banned_categories:
             return markets
-        normalized = {c.strip().lower() for c in banned_categories if c.strip()}
-        return [m for m in markets if m.category.strip().lower() not in normalized]
+        return [m for m in markets if m.category not in banned_categories]
 
     @staticmethod
     def _extract_float(value: object) -> float | None:
@@ -227,8 +260,8 @@ class GammaCache:
 
         if isinstance(value, str):
             try:
-                parsed = json.loads(value)
-            except json.JSONDecodeError as exc:
+                parsed = orjson.loads(value)
+            except orjson.JSONDecodeError as exc:
                 raise ValueError(
                     f"Invalid {field_name}: failed to parse JSON list from "
                     f"type={type(value).__name__} value={value_preview(value)}"
@@ -251,12 +284,47 @@ class GammaCache:
         slug = build_slug(horizon_minutes, start_epoch)
         now = int(time.time())
         cached = self._cache.get(slug)
-        if cached and cached[1] > now:
+        if cached is not None and cached[1] <= now:
+            del self._cache[slug]
+            cached = None
+        if cached is not None:
+            self._cache.move_to_end(slug)
             self._hits += 1
-            total = self._hits + self._misses
-            logger.info("gamma_cache_hit", slug=slug, hit_rate=(self._hits / max(1, total)))
+            hits = self._hits
+            if hits % _HIT_LOG_EVERY == 1:
+                logger.info("gamma_cache_hit", slug=slug, hits=hits, hit_rate=(hits / (hits + self._misses)))
             return cached[0]
 
+        inflight = self._inflight.get(slug)
+        if inflight is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except _FetchAbandoned:
+                # The owning caller was cancelled, not us; run the fetch ourselves.
+                return await self.get_market(horizon_minutes, start_epoch)
+
+        fut: asyncio.Future[UpDownMarket] = asyncio.get_running_loop().create_future()
+        self._inflight[slug] = fut
+        try:
+            market = await self._fetch_market(slug, horizon_minutes, start_epoch)
+        except asyncio.CancelledError:
+            # Cancelling the shared future would cancel every waiter; hand them a retryable error instead.
+            self._inflight.pop(slug, None)
+            fut.set_exception(_FetchAbandoned(slug))
+            fut.exception()
+            raise
+        except Exception as exc:
+            fut.set_exception(exc)
+            # Mark retrieved so a fetch nobody else joined does not log "never retrieved".
+            fut.exception()
+            raise
+        else:
+            fut.set_result(market)
+            return market
+        finally:
+            self._inflight.pop(slug, None)
+
+    async def _fetch_market(self, slug: str, horizon_minutes: int, start_epoch: int) -> UpDownMarket:
         self._misses += 1
         started = time.perf_counter()
         url = f"{self.base_url}/markets"
@@ -266,7 +334,7 @@ class GammaCache:
             session = await self._get_session()
             async with session.get(url, params=params, timeout=10) as response:
                 response.raise_for_status()
-                rows = await response.json()
+                rows = await response.json(loads=orjson.loads)
         except asyncio.TimeoutError as exc:
             raise RuntimeError("Gamma API timeout") from exc
         except aiohttp.ClientResponseError as exc:
@@ -316,7 +384,7 @@ class GammaCache:
             category=self.classify_market_category(row),
             token_metadata_by_id=token_metadata,
         )
-        self._cache[slug] = (market, market.end_epoch)
+        self._store(slug, market)
 
         duration_ms = (time.perf_counter() - started) * 1000
         total = self._hits + self._misses
@@ -334,5 +402,58 @@ class GammaCache:
         )
         return market
 
+    def _store(self, slug: str, market: UpDownMarket) -> None:
+        cache = self._cache
+        cache[slug] = (market, market.end_epoch)
+        cache.move_to_end(slug)
+        now = int(time.time())
+        while cache:
+            oldest_slug, (_, oldest_end_epoch) = next(iter(cache.items()))
+            if oldest_end_epoch > now:
+                break
+            del cache[oldest_slug]
+        if len(cache) > self.max_entries:
+            # Recently used entries can expire too; drop every expired one before evicting a live market.
+            for expired_slug in [key for key, (_, end_epoch) in cache.items() if end_epoch <= now]:
+                del cache[expired_slug]
+            while len(cache) > self.max_entries:
+                cache.popitem(last=False)
+
     async def warm(self, horizon_minutes: int, start_epochs: list[int]) -> None:
-        await asyncio.gather(*[self.get_market(horizon_minutes, s) for s in start_epochs])
+        if len(start_epochs) == 1:
+            await self.get_market(horizon_minutes, start_epochs[0])
+            return
+
+        sem = asyncio.Semaphore(_WARM_CONCURRENCY)
+
+        async def _one(start_epoch: int) -> None:
+            async with sem:
+                await self.get_market(horizon_minutes, start_epoch)
+
+        await asyncio.gather(*[_one(s) for s in start_epochs])
+
+    def prefetch(self, horizon_minutes: int, start_epochs: list[int]) -> None:
+        """Warm upcoming buckets in the background without blocking the caller.
+
+        Each bucket is attempted once; a market Gamma has not listed yet is picked up by the
+        regular refresh once it becomes the next bucket.
+        """
+        now = int(time.time())
+        attempted = self._prefetch_attempted
+        attempted.difference_update([key for key in attempted if key[1] < now])
+        pending = [start for start in start_epochs if (horizon_minutes, start) not in attempted]
+        if not pending:
+            return
+        attempted.update((horizon_minutes, start) for start in pending)
+        task = asyncio.create_task(self.warm(horizon_minutes, pending))
+        self._prefetch_tasks.add(task)
+        task.add_done_callback(self._on_prefetch_done)
+
+    def _on_prefetch_done(self, task: asyncio.Task[None]) -> None:
+        self._prefetch_tasks.discard(task)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None:
+            # Future buckets are routinely unlisted this far ahead, so a miss here is not actionable.
+            logger.debug("gamma_prefetch_failed", error=str(exc))
@@ -18,35 +18,28 @@ class TokenMetadata:
 @dataclass(slots=True)
 class _CacheEntry:
     metadata: TokenMetadata
-    updated_at: float
+    updated_at_ns: int
 
 
 class TokenMetadataCache:
     def __init__(self, ttl_seconds: float = 300.0) -> None:
         self.ttl_seconds = ttl_seconds
+        self._ttl_ns = int(ttl_seconds * 1_000_000_000)
         self._cache: dict[str, _CacheEntry] = {}
 
     def put(self, token_id: str, metadata: TokenMetadata) -> None:
-        self._cache[token_id] = _CacheEntry(metadata=metadata, updated_at=time.time())
+        self._cache[token_id] = _CacheEntry(metadata=metadata, updated_at_ns=time.monotonic_ns())
 
     def put_many(self, values: dict[str, TokenMetadata]) -> None:
-        now = time.time()
-        for token_id, metadata in values.items():
-            self._cache[token_id] = _CacheEntry(
-                metadata=TokenMetadata(
-                    tick_size=metadata.tick_size,
-                    min_order_size=metadata.min_order_size,
-                    fee_rate_bps=metadata.fee_rate_bps,
-                ),
-                updated_at=now,
-            )
+        now_ns = time.monotonic_ns()
+        # TokenMetadata is treated as immutable once cached, so entries share the caller's instances.
+        self._cache.update({token_id: _CacheEntry(metadata=metadata, updated_at_ns=now_ns) for token_id, metadata in values.items()})
 
     def _entry(self, token_id: str) -> tuple[_CacheEntry | None, bool]:
         entry = self._cache.get(token_id)
         if entry is None:
             return None, False
-        age_seconds = max(0.0, time.time() - entry.updated_at)
-        return entry, age_seconds <= self.ttl_seconds
+        return entry, (time.monotonic_ns() - entry.updated_at_ns) <= self._ttl_ns
 
     def get(self, token_id: str, *, allow_stale: bool = True) -> TokenMetadata | None:
         entry, is_fresh = self._entry(token_id)
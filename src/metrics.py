@@ -1,8 +1,15 @@
 from __future__ import annotations
 
+from functools import lru_cache
+from typing import Any
+
+REGISTRY: Any
+
 try:
-    from prometheus_client import Counter, Gauge, start_http_server
+    from prometheus_client import REGISTRY, Counter, Gauge, start_http_server
 except Exception:  # pragma: no cover
+    REGISTRY = None
+
     class _NoopMetric:
         def inc(self, *_args, **_kwargs):
             return None
@@ -22,78 +29,120 @@ except Exception:  # pragma: no cover
     def start_http_server(*_args, **_kwargs):
         return None
 
-BOT_API_CREDS_AGE_SECONDS = Gauge("bot_api_creds_age_seconds", "Age of active API credentials in seconds")
-BOT_FEE_FETCH_FAILURES_TOTAL = Counter("bot_fee_fetch_failures_total", "Number of fee-rate fetch failures")
-BOT_FEE_RATE_BPS = Gauge("bot_fee_rate_bps", "Resolved fee rate in bps by token", ["token_id"])
-WATCH_EVENTS = Counter("bot_watch_events_total", "Number of watch triggers")
-WATCH_TRIGGERED = Counter("bot_watch_triggered_total", "Number of watch mode trigger events")
-HAMMER_ATTEMPTED = Counter("bot_hammer_attempted_total", "Number of hammer order attempts")
-HAMMER_FILLED = Counter("bot_hammer_filled_total", "Number of hammer order fills")
-REJECTED_MAX_ENTRY_PRICE = Counter(
+
+def _registered(name: str, kind: type, documentation: str, labelnames) -> Any:
+    if REGISTRY is None:
+        return None
+    existing = REGISTRY._names_to_collectors.get(name)
+    if existing is None:
+        return None
+    if (
+        not isinstance(existing, kind)
+        or getattr(existing, "_documentation", None) != documentation
+        or tuple(getattr(existing, "_labelnames", ())) != tuple(labelnames)
+    ):
+        raise ValueError(f"metric {name} is already registered with a different type, documentation or labels")
+    return existing
+
+
+def _counter(name: str, documentation: str, labelnames=(), **kwargs):
+    existing = _registered(name, Counter, documentation, labelnames)
+    return existing if existing is not None else Counter(name, documentation, labelnames, **kwargs)
+
+
+def _gauge(name: str, documentation: str, labelnames=(), **kwargs):
+    existing = _registered(name, Gauge, documentation, labelnames)
+    return existing if existing is not None else Gauge(name, documentation, labelnames, **kwargs)
+
+
+BOT_API_CREDS_AGE_SECONDS = _gauge("bot_api_creds_age_seconds", "Age of active API credentials in seconds")
+BOT_FEE_FETCH_FAILURES_TOTAL = _counter("bot_fee_fetch_failures_total", "Number of fee-rate fetch failures")
+BOT_FEE_RATE_BPS = _gauge("bot_fee_rate_bps", "Resolved fee rate in bps by token", ["token_id"])
+WATCH_EVENTS = _counter("bot_watch_events_total", "Number of watch triggers")
+WATCH_TRIGGERED = _counter("bot_watch_triggered_total", "Number of watch mode trigger events")
+HAMMER_ATTEMPTED = _counter("bot_hammer_attempted_total", "Number of hammer order attempts")
+HAMMER_FILLED = _counter("bot_hammer_filled_total", "Number of hammer order fills")
+REJECTED_MAX_ENTRY_PRICE = _counter(
     "bot_rejected_max_entry_price_total",
     "Number of candidates rejected due to max entry price guardrail",
 )
-STALE_FEED = Counter("bot_stale_feed_total", "Number of stale feed/staleness events detected")
-TRADES = Counter("bot_trades_total", "Trades placed", ["status", "side", "horizon"])
-CLOB_DROPPED_MESSAGES = Counter(
+STALE_FEED = _counter("bot_stale_feed_total", "Number of stale feed/staleness events detected")
+TRADES = _counter("bot_trades_total", "Trades placed", ["status", "side", "horizon"])
+CLOB_DROPPED_MESSAGES = _counter(
     "bot_clob_dropped_messages_total",
     "Number of CLOB websocket payloads dropped during parsing",
     ["reason", "event_type"],
 )
-CLOB_PRICE_CHANGE_PARSED = Counter(
+CLOB_PRICE_CHANGE_PARSED = _counter(
     "clob_price_change_parsed_total",
     "Number of CLOB price_change updates successfully parsed",
     ["schema"],
 )
-CURRENT_EV = Gauge("bot_current_best_ev", "Best EV at decision point")
-DAILY_REALIZED_PNL = Gauge("bot_daily_realized_pnl_usd", "Daily realized PnL in USD")
-RISK_LIMIT_BLOCKED = Counter("bot_risk_limit_blocked", "Number of risk-limit order blocks")
-MAX_DAILY_LOSS_USD_CONFIGURED = Gauge("bot_max_daily_loss_usd_configured", "Configured absolute max daily loss in USD")
-MAX_DAILY_LOSS_PCT_CONFIGURED = Gauge("bot_max_daily_loss_pct_configured", "Configured max daily loss as pct of equity")
-MAX_OPEN_EXPOSURE_PER_MARKET_USD_CONFIGURED = Gauge(
+CURRENT_EV = _gauge("bot_current_best_ev", "Best EV at decision point")
+DAILY_REALIZED_PNL = _gauge("bot_daily_realized_pnl_usd", "Daily realized PnL in USD")
+RISK_LIMIT_BLOCKED = _counter("bot_risk_limit_blocked", "Number of risk-limit order blocks")
+MAX_DAILY_LOSS_USD_CONFIGURED = _gauge("bot_max_daily_loss_usd_configured", "Configured absolute max daily loss in USD")
+MAX_DAILY_LOSS_PCT_CONFIGURED = _gauge("bot_max_daily_loss_pct_configured", "Configured max daily loss as pct of equity")
+MAX_OPEN_EXPOSURE_PER_MARKET_USD_CONFIGURED = _gauge(
     "bot_max_open_exposure_per_market_usd_configured",
     "Configured max open exposure per market in USD",
 )
-MAX_OPEN_EXPOSURE_PER_MARKET_PCT_CONFIGURED = Gauge(
+MAX_OPEN_EXPOSURE_PER_MARKET_PCT_CONFIGURED = _gauge(
     "bot_max_open_exposure_per_market_pct_configured",
     "Configured max open exposure per market as pct of equity",
 )
-MAX_TOTAL_OPEN_EXPOSURE_USD_CONFIGURED = Gauge(
+MAX_TOTAL_OPEN_EXPOSURE_USD_CONFIGURED = _gauge(
     "bot_max_total_open_exposure_usd_configured",
     "Configured max total open exposure in USD",
 )
-MAX_TOTAL_OPEN_EXPOSURE_PCT_CONFIGURED = Gauge(
+MAX_TOTAL_OPEN_EXPOSURE_PCT_CONFIGURED = _gauge(
     "bot_max_total_open_exposure_pct_configured",
     "Configured max total open exposure as pct of equity",
 )
-KILL_SWITCH_ACTIVE = Gauge("bot_kill_switch_active", "1 if divergence kill-switch is active")
-TRADING_ALLOWED = Gauge("bot_trading_allowed", "1 if trading is currently allowed")
-GEOBLOCK_BLOCKED = Gauge(
+KILL_SWITCH_ACTIVE = _gauge("bot_kill_switch_active", "1 if divergence kill-switch is active")
+TRADING_ALLOWED = _gauge("bot_trading_allowed", "1 if trading is currently allowed")
+GEOBLOCK_BLOCKED = _gauge(
     "bot_geoblock_blocked",
     "1 if the current deployment IP is geoblocked for trading",
     ["country", "region"],
 )
-ORACLE_SPOT_DIVERGENCE_PCT = Gauge(
+ORACLE_SPOT_DIVERGENCE_PCT = _gauge(
     "bot_oracle_spot_divergence_pct",
     "Percent divergence between oracle and spot quorum consensus",
 )
-FEED_LAG_SECONDS = Gauge("feed_lag_seconds", "Current feed lag in seconds", ["feed"])
-FEED_BLOCKED_STALE_PRICE = Gauge("feed_blocked_stale_price", "1 if stale price feed is currently blocking trading")
-FEED_MODE = Gauge("bot_feed_mode", "Current execution-authoritative feed mode", ["mode"])
-RECOVERY_STABILIZATION_ACTIVE = Gauge(
+FEED_LAG_SECONDS = _gauge("feed_lag_seconds", "Current feed lag in seconds", ["feed"])
+FEED_BLOCKED_STALE_PRICE = _gauge("feed_blocked_stale_price", "1 if stale price feed is currently blocking trading")
+FEED_MODE = _gauge("bot_feed_mode", "Current execution-authoritative feed mode", ["mode"])
+RECOVERY_STABILIZATION_ACTIVE = _gauge(
     "bot_recovery_stabilization_active",
     "1 while waiting for RTDS freshness stabilization before live trading resumes",
 )
 
-HEARTBEAT_SEND_ATTEMPTS = Counter("bot_heartbeat_send_attempts_total", "Number of heartbeat send attempts")
-HEARTBEAT_SEND_SUCCESS = Counter("bot_heartbeat_send_success_total", "Number of successful heartbeat sends")
-HEARTBEAT_SEND_FAILURE = Counter("bot_heartbeat_send_failure_total", "Number of failed heartbeat sends")
-HEARTBEAT_CONSECUTIVE_MISSES = Gauge("bot_heartbeat_consecutive_misses", "Current consecutive heartbeat misses")
-HEARTBEAT_CANCEL_ACTIONS = Counter(
+HEARTBEAT_SEND_ATTEMPTS = _counter("bot_heartbeat_send_attempts_total", "Number of heartbeat send attempts")
+HEARTBEAT_SEND_SUCCESS = _counter("bot_heartbeat_send_success_total", "Number of successful heartbeat sends")
+HEARTBEAT_SEND_FAILURE = _counter("bot_heartbeat_send_failure_total", "Number of failed heartbeat sends")
+HEARTBEAT_CONSECUTIVE_MISSES = _gauge("bot_heartbeat_consecutive_misses", "Current consecutive heartbeat misses")
+HEARTBEAT_CANCEL_ACTIONS = _counter(
     "bot_heartbeat_cancel_actions_total",
     "Cancel actions triggered after heartbeat failures",
     ["status"],
 )
 
+
+@lru_cache(maxsize=8)
+def clob_price_change_parsed(schema: str):
+    return CLOB_PRICE_CHANGE_PARSED.labels(schema=schema)
+
+
+@lru_cache(maxsize=8)
+def feed_lag_seconds(feed: str):
+    return FEED_LAG_SECONDS.labels(feed=feed)
+
+
+@lru_cache(maxsize=8)
+def feed_mode(mode: str):
+    return FEED_MODE.labels(mode=mode)
+
+
 def start_metrics_server(host: str, port: int) -> None:
     start_http_server(port=port, addr=host)
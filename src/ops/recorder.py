@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import asyncio
+import os
+import queue
+import threading
 import time
 from pathlib import Path
 from typing import Any
@@ -10,6 +13,8 @@ import structlog
 
 logger = structlog.get_logger(__name__)
 
+_WRITE_BATCH_SIZE = 512
+
 
 class EventRecorder:
     """Append-only JSONL recorder with non-blocking enqueue semantics."""
@@ -17,50 +22,100 @@ class EventRecorder:
     def __init__(self, output_path: str | Path, *, queue_maxsize: int = 10_000, enabled: bool = True) -> None:
         self.output_path = Path(output_path)
         self.enabled = enabled
-        self._queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue(maxsize=max(1, queue_maxsize))
-        self._writer_task: asyncio.Task[None] | None = None
+        self._queue: queue.Queue[dict[str, Any] | None] = queue.Queue(maxsize=max(1, queue_maxsize))
+        self._writer_thread: threading.Thread | None = None
         self._dropped_events = 0
+        self._writer_error: BaseException | None = None
 
     async def start(self) -> None:
-        if not self.enabled or self._writer_task is not None:
+        if not self.enabled or self._writer_thread is not None:
             return
         self.output_path.parent.mkdir(parents=True, exist_ok=True)
-        self._writer_task = asyncio.create_task(self._writer_loop())
+        self._writer_thread = threading.Thread(target=self._writer_loop, name="event-recorder", daemon=True)
+        self._writer_thread.start()
 
     async def stop(self) -> None:
         if not self.enabled:
             return
-        if self._writer_task is None:
+        if self._writer_thread is None:
             return
-        await self._queue.put(None)
-        await self._writer_task
-        self._writer_task = None
+        writer = self._writer_thread
+        await asyncio.to_thread(self._put_stop_sentinel, writer)
+        await asyncio.to_thread(writer.join)
+        self._writer_thread = None
+        error, self._writer_error = self._writer_error, None
+        if error is not None:
+            raise RuntimeError("event recorder writer failed") from error
+
+    def _put_stop_sentinel(self, writer: threading.Thread) -> None:
+        # A dead writer never drains the queue, so a blocking put could hang forever.
+        while writer.is_alive():
+            try:
+                self._queue.put(None, timeout=0.1)
+                return
+            except queue.Full:
+                continue
 
     def record(self, event_type: str, **payload: Any) -> None:
         if not self.enabled:
             return
+        if self._queue.full():
+            self._record_drop()
+            return
         event = {
             "type": event_type,
-            "ts": float(payload.get("ts", time.time())),
+            "ts": float(payload["ts"]) if "ts" in payload else time.time(),
             **payload,
         }
         try:
             self._queue.put_nowait(event)
-        except asyncio.QueueFull:
-            self._dropped_events += 1
-            if self._dropped_events in {1, 10, 100} or self._dropped_events % 1000 == 0:
-                logger.warning("recorder_queue_full", dropped_events=self._dropped_events)
-
-    async def _writer_loop(self) -> None:
-        with self.output_path.open("ab") as handle:
-            while True:
-                item = await self._queue.get()
-                if item is None:
-                    break
-                handle.write(orjson.dumps(item))
-                handle.write(b"\n")
-                if self._queue.empty():
-                    handle.flush()
+        except queue.Full:
+            self._record_drop()
+
+    def _record_drop(self) -> None:
+        self._dropped_events += 1
+        if self._dropped_events in {1, 10, 100} or self._dropped_events % 1000 == 0:
+            logger.warning("recorder_queue_full", dropped_events=self._dropped_events)
+
+    def _writer_loop(self) -> None:
+        try:
+            self._write_until_stopped()
+        except BaseException as exc:
+            self._writer_error = exc
+            logger.exception("recorder_writer_failed", path=str(self.output_path))
+
+    def _write_until_stopped(self) -> None:
+        fd = os.open(self.output_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            stopping = False
+            while not stopping:
+                item = self._queue.get()
+                batch: list[bytes] = []
+                while item is not None:
+                    try:
+                        batch.append(orjson.dumps(item))
+                    except TypeError:
+                        logger.warning("recorder_event_unserializable", event_type=item.get("type"))
+                    if len(batch) >= _WRITE_BATCH_SIZE:
+                        break
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                else:
+                    stopping = True
+                if batch:
+                    batch.append(b"")
+                    _write_all(fd, b"\n".join(batch))
+        finally:
+            os.close(fd)
+
+
+def _write_all(fd: int, payload: bytes) -> None:
+    view = memoryview(payload)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
 
 
 __all__ = ["EventRecorder"]
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import math
+from bisect import bisect_left
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Literal
+from typing import Iterable, Literal
 
 import orjson
 import structlog
@@ -18,12 +19,19 @@ class ProbabilityCalibrator:
     def calibrate(self, value: float) -> float:
         raise NotImplementedError
 
+    def calibrate_many(self, values: Iterable[float]) -> list[float]:
+        calibrate = self.calibrate
+        return [calibrate(value) for value in values]
+
 
 @dataclass(slots=True)
 class IdentityCalibrator(ProbabilityCalibrator):
     def calibrate(self, value: float) -> float:
         return min(1.0, max(0.0, value))
 
+    def calibrate_many(self, values: Iterable[float]) -> list[float]:
+        return [min(1.0, max(0.0, value)) for value in values]
+
 
 @dataclass(slots=True)
 class LogisticCalibrator(ProbabilityCalibrator):
@@ -34,6 +42,12 @@ class LogisticCalibrator(ProbabilityCalibrator):
         logit = (self.coef * value) + self.intercept
         return 1.0 / (1.0 + math.exp(-logit))
 
+    def calibrate_many(self, values: Iterable[float]) -> list[float]:
+        coef = self.coef
+        intercept = self.intercept
+        exp = math.exp
+        return [1.0 / (1.0 + exp(-((coef * value) + intercept))) for value in values]
+
 
 @dataclass(slots=True)
 class IsotonicCalibrator(ProbabilityCalibrator):
@@ -44,14 +58,19 @@ class IsotonicCalibrator(ProbabilityCalibrator):
         if len(self.x) != len(self.y) or len(self.x) < 2:
             raise ValueError("isotonic calibrator requires >=2 x/y points")
 
-        pairs = sorted(zip(self.x, self.y), key=lambda row: row[0])
-        self.x = [p[0] for p in pairs]
-
+        xs = self.x
+        ys = self.y
+        order = sorted(range(len(xs)), key=xs.__getitem__)
+        sorted_x: list[float] = []
         monotonic_y: list[float] = []
         running = 0.0
-        for _, yi in pairs:
-            running = max(running, yi)
+        for i in order:
+            sorted_x.append(xs[i])
+            yi = ys[i]
+            if yi > running:
+                running = yi
             monotonic_y.append(min(1.0, max(0.0, running)))
+        self.x = sorted_x
         self.y = monotonic_y
 
     def calibrate(self, value: float) -> float:
@@ -60,17 +79,14 @@ class IsotonicCalibrator(ProbabilityCalibrator):
         if value >= self.x[-1]:
             return self.y[-1]
 
-        for i in range(1, len(self.x)):
-            if value <= self.x[i]:
-                x0, x1 = self.x[i - 1], self.x[i]
-                y0, y1 = self.y[i - 1], self.y[i]
-                span = x1 - x0
-                if span <= 0:
-                    return y1
-                w = (value - x0) / span
-                return y0 + (w * (y1 - y0))
-
-        return self.y[-1]
+        i = bisect_left(self.x, value)
+        x0, x1 = self.x[i - 1], self.x[i]
+        y0, y1 = self.y[i - 1], self.y[i]
+        span = x1 - x0
+        if span <= 0:
+            return y1
+        w = (value - x0) / span
+        return y0 + (w * (y1 - y0))
 
 
 def _read_params(params_path: str | None) -> dict[str, object] | None:
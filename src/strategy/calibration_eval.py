@@ -3,6 +3,7 @@ from __future__ import annotations
 import argparse
 import csv
 from dataclasses import dataclass
+from operator import mul, sub
 
 
 @dataclass(slots=True)
@@ -17,7 +18,9 @@ class CalibrationBin:
 def brier_score(probabilities: list[float], outcomes: list[int]) -> float:
     if len(probabilities) != len(outcomes) or not probabilities:
         raise ValueError("probabilities and outcomes must be same non-zero length")
-    return sum((p - y) ** 2 for p, y in zip(probabilities, outcomes)) / len(probabilities)
+    # Differences are taken before squaring; expanding p^2 - 2py + y^2 cancels badly for near-perfect forecasts.
+    diffs = list(map(sub, probabilities, outcomes))
+    return sum(map(mul, diffs, diffs)) / len(probabilities)
 
 
 def calibration_curve(probabilities: list[float], outcomes: list[int], bins: int = 10) -> list[CalibrationBin]:
@@ -26,26 +29,31 @@ def calibration_curve(probabilities: list[float], outcomes: list[int], bins: int
     if len(probabilities) != len(outcomes):
         raise ValueError("probabilities and outcomes must be same length")
 
-    bucket_preds: list[list[float]] = [[] for _ in range(bins)]
-    bucket_obs: list[list[int]] = [[] for _ in range(bins)]
+    counts = [0] * bins
+    pred_sums = [0.0] * bins
+    obs_sums = [0] * bins
 
+    last_bin = bins - 1
     for p, y in zip(probabilities, outcomes):
-        clamped = min(1.0, max(0.0, p))
-        idx = min(bins - 1, int(clamped * bins))
-        bucket_preds[idx].append(clamped)
-        bucket_obs[idx].append(y)
+        # Equivalent to min(1.0, max(0.0, p)), including NaN -> 0.0.
+        clamped = p if 0.0 < p <= 1.0 else (1.0 if p > 1.0 else 0.0)
+        idx = int(clamped * bins)
+        if idx > last_bin:
+            idx = last_bin
+        counts[idx] += 1
+        pred_sums[idx] += clamped
+        obs_sums[idx] += y
 
     rows: list[CalibrationBin] = []
     for i in range(bins):
         start = i / bins
         end = (i + 1) / bins
-        if not bucket_preds[i]:
+        count = counts[i]
+        if not count:
             rows.append(CalibrationBin(start, end, 0, 0.0, 0.0))
             continue
 
-        mean_pred = sum(bucket_preds[i]) / len(bucket_preds[i])
-        empirical = sum(bucket_obs[i]) / len(bucket_obs[i])
-        rows.append(CalibrationBin(start, end, len(bucket_preds[i]), mean_pred, empirical))
+        rows.append(CalibrationBin(start, end, count, pred_sums[i] / count, obs_sums[i] / count))
 
     return rows
 
@@ -2,14 +2,17 @@ from __future__ import annotations
 
 import argparse
 import csv
-from bisect import bisect_left
-from dataclasses import dataclass
+import sys
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from itertools import product
 from pathlib import Path
+from typing import cast
 
 import orjson
 from markets.gamma_cache import UpDownMarket
-from strategy.replay_engine import ReplayEngine, load_recorded_events
+from strategy.replay_engine import ReplayEngine, ReplaySession, load_recorded_events
 from strategy.state_machine import StrategyStateMachine
 
 
@@ -33,17 +36,16 @@ class FilledTrade:
     ev: float
     start_price: float
     end_price: float
+    won: bool = field(init=False, repr=False, compare=False)
+    pnl: float = field(init=False, repr=False, compare=False)
 
-    @property
-    def won(self) -> bool:
+    def __post_init__(self) -> None:
         if self.direction == "UP":
-            return self.end_price > self.start_price
-        return self.end_price <= self.start_price
-
-    @property
-    def pnl(self) -> float:
+            self.won = self.end_price > self.start_price
+        else:
+            self.won = self.end_price <= self.start_price
         payout = 1.0 if self.won else 0.0
-        return payout - self.ask - self.fee_cost
+        self.pnl = payout - self.ask - self.fee_cost
 
     @property
     def ev_error(self) -> float:
@@ -59,16 +61,34 @@ def _parse_float(raw: str | None) -> float | None:
 def load_replay_rows(path: Path) -> list[ReplayRow]:
     rows: list[ReplayRow] = []
     with path.open("r", encoding="utf-8", newline="") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return rows
+        width = len(header)
+        columns = {name: i for i, name in enumerate(header)}
+        ts_i = columns["ts"]
+        event_i = columns["event"]
+        # Absent optional columns point at a trailing empty cell appended to every record.
+        price_i = columns.get("price", width)
+        token_i = columns.get("token_id", width)
+        bid_i = columns.get("bid", width)
+        ask_i = columns.get("ask", width)
+        for cells in reader:
+            if not cells:
+                continue
+            if len(cells) != width:
+                del cells[width:]
+                cells.extend([""] * (width - len(cells)))
+            cells.append("")
             rows.append(
                 ReplayRow(
-                    ts=float(row["ts"]),
-                    event=row["event"].strip().lower(),
-                    price=_parse_float(row.get("price")),
-                    token_id=row.get("token_id") or None,
-                    bid=_parse_float(row.get("bid")),
-                    ask=_parse_float(row.get("ask")),
+                    ts=float(cells[ts_i]),
+                    event=sys.intern(cells[event_i].strip().lower()),
+                    price=_parse_float(cells[price_i]),
+                    token_id=sys.intern(cells[token_i]) or None,
+                    bid=_parse_float(cells[bid_i]),
+                    ask=_parse_float(cells[ask_i]),
                 )
             )
     return sorted(rows, key=lambda r: r.ts)
@@ -79,15 +99,6 @@ def load_markets(path: Path) -> list[UpDownMarket]:
     return [UpDownMarket(**row) for row in payload]
 
 
-def _max_drawdown(equity_curve: list[float]) -> float:
-    peak = float("-inf")
-    max_dd = 0.0
-    for value in equity_curve:
-        peak = max(peak, value)
-        max_dd = min(max_dd, value - peak)
-    return abs(max_dd)
-
-
 def replay_with_params(rows: list[ReplayRow], markets: list[UpDownMarket], params: dict[str, float | int]) -> dict[str, float | int]:
     sm = StrategyStateMachine(
         threshold=float(params["watch_return_threshold"]),
@@ -104,32 +115,61 @@ def replay_with_params(rows: list[ReplayRow], markets: list[UpDownMarket], param
     price_rows = [r for r in rows if r.event == "price" and r.price is not None]
     price_ts = [int(r.ts) for r in price_rows]
 
+    pending_start_epochs: dict[int, int] = {}
+    for market in all_markets:
+        key = market.horizon_minutes * 60
+        pending_start_epochs[key] = min(market.start_epoch, pending_start_epochs.get(key, market.start_epoch))
+
+    # pick_best only scores markets inside the hammer window, so each tick hands it just that slice.
+    order_by_end = sorted(range(len(all_markets)), key=lambda idx: all_markets[idx].end_epoch)
+    end_epochs = [all_markets[idx].end_epoch for idx in order_by_end]
+    hammer_secs = sm.hammer_secs
+
     trades: list[FilledTrade] = []
     trade_keys: set[tuple[str, int]] = set()
+    price_count = len(price_rows)
+    end_prices: dict[int, float | None] = {}
+    sm_on_book = sm.on_book
+    sm_on_price = sm.on_price
+    sm_pick_best = sm.pick_best
+    start_prices = sm.start_prices
 
     for row in rows:
-        if row.event == "book" and row.token_id:
-            asks_levels = [(row.ask, 1_000_000.0)] if row.ask is not None else None
-            bids_levels = [(row.bid, 1_000_000.0)] if row.bid is not None else None
-            sm.on_book(row.token_id, row.bid, row.ask, ask_size=1_000_000.0 if row.ask is not None else None, bid_size=1_000_000.0 if row.bid is not None else None, asks_levels=asks_levels, bids_levels=bids_levels)
+        event = row.event
+        if event == "book" and row.token_id:
+            bid = row.bid
+            ask = row.ask
+            asks_levels = [(ask, 1_000_000.0)] if ask is not None else None
+            bids_levels = [(bid, 1_000_000.0)] if bid is not None else None
+            sm_on_book(row.token_id, bid, ask, ask_size=1_000_000.0 if ask is not None else None, bid_size=1_000_000.0 if bid is not None else None, asks_levels=asks_levels, bids_levels=bids_levels)
             continue
-        if row.event != "price" or row.price is None:
+        price = row.price
+        if event != "price" or price is None:
             continue
 
-        sm.on_price(row.ts, row.price, {"source": "chainlink_rtds", "timestamp": row.ts})
-        now = int(row.ts)
+        ts = row.ts
+        sm_on_price(ts, price, {"source": "chainlink_rtds", "timestamp": ts})
+        now = int(ts)
 
-        for market in all_markets:
-            key = market.horizon_minutes * 60
-            if key in sm.start_prices:
-                continue
-            if now >= market.start_epoch:
-                sm.start_prices[key] = float(row.price)
+        if pending_start_epochs:
+            for key, start_epoch in list(pending_start_epochs.items()):
+                if key in start_prices:
+                    del pending_start_epochs[key]
+                elif now >= start_epoch:
+                    start_prices[key] = float(price)
+                    del pending_start_epochs[key]
 
         if not sm.watch_mode:
             continue
 
-        best = sm.pick_best(now, all_markets, {})
+        lo = bisect_left(end_epochs, now)
+        hi = bisect_right(end_epochs, now + hammer_secs)
+        if lo >= hi:
+            continue
+        window = order_by_end[lo:hi]
+        if len(window) > 1:
+            window.sort()
+        best = sm_pick_best(now, [all_markets[idx] for idx in window], {})
         if best is None or best.ev <= 0:
             continue
 
@@ -138,15 +178,20 @@ def replay_with_params(rows: list[ReplayRow], markets: list[UpDownMarket], param
             continue
         trade_keys.add(trade_key)
 
-        start_price = sm.start_prices.get(best.market.horizon_minutes * 60)
+        start_price = start_prices.get(best.market.horizon_minutes * 60)
         if start_price is None:
             continue
 
-        end_idx = bisect_left(price_ts, best.market.end_epoch)
-        if end_idx >= len(price_rows):
+        end_epoch = best.market.end_epoch
+        if end_epoch in end_prices:
+            end_price = end_prices[end_epoch]
+        else:
+            end_idx = bisect_left(price_ts, end_epoch)
+            end_price = float(price_rows[end_idx].price) if end_idx < price_count else None
+            end_prices[end_epoch] = end_price
+        if end_price is None:
             continue
 
-        end_price = float(price_rows[end_idx].price)
         trades.append(
             FilledTrade(
                 ts=now,
@@ -172,14 +217,20 @@ def replay_with_params(rows: list[ReplayRow], markets: list[UpDownMarket], param
             "total_pnl": 0.0,
         }
 
-    wins = sum(1 for t in trades if t.won)
+    wins = 0
     total_pnl = 0.0
-    curve: list[float] = []
-    ev_errors: list[float] = []
+    peak = float("-inf")
+    max_dd = 0.0
+    ev_error_total = 0.0
     for trade in trades:
-        total_pnl += trade.pnl
-        curve.append(total_pnl)
-        ev_errors.append(abs(trade.ev_error))
+        wins += trade.won
+        trade_pnl = trade.pnl
+        total_pnl += trade_pnl
+        if total_pnl > peak:
+            peak = total_pnl
+        elif total_pnl - peak < max_dd:
+            max_dd = total_pnl - peak
+        ev_error_total += abs(trade_pnl - trade.ev)
 
     span_secs = max(1.0, rows[-1].ts - rows[0].ts)
     trades_per_hour = len(trades) / (span_secs / 3600.0)
@@ -189,8 +240,8 @@ def replay_with_params(rows: list[ReplayRow], markets: list[UpDownMarket], param
         "closed_markets": len(closed_markets),
         "trades": len(trades),
         "win_rate": wins / len(trades),
-        "avg_ev_error": sum(ev_errors) / len(ev_errors),
-        "max_drawdown": _max_drawdown(curve),
+        "avg_ev_error": ev_error_total / len(trades),
+        "max_drawdown": abs(max_dd),
         "trade_frequency_per_hour": trades_per_hour,
         "total_pnl": total_pnl,
     }
@@ -204,6 +255,48 @@ def _parse_grid(grid_raw: str) -> dict[str, list[float]]:
     return parsed
 
 
+_SweepInputs = tuple[list[ReplayRow] | None, list[UpDownMarket], tuple[ReplayEngine, ReplaySession] | None]
+_sweep_worker_inputs: _SweepInputs | None = None
+
+
+def _evaluate_params(
+    rows: list[ReplayRow] | None,
+    markets: list[UpDownMarket],
+    params: dict[str, float | int],
+    replay: tuple[ReplayEngine, ReplaySession] | None,
+) -> dict[str, float | int]:
+    if replay is None:
+        assert rows is not None
+        return replay_with_params(rows, markets, params)
+
+    engine, session = replay
+    _trades, summary = engine.evaluate(session, params)
+    return {
+        **params,
+        "closed_markets": len(markets),
+        "trades": summary.trade_count,
+        "win_rate": summary.win_rate,
+        "avg_ev_error": 0.0,
+        "max_drawdown": summary.max_drawdown,
+        "trade_frequency_per_hour": 0.0,
+        "total_pnl": summary.pnl,
+        "avg_fee": summary.avg_fee,
+        "avg_slippage": summary.avg_slippage,
+        "fok_fail_pct": summary.fok_fail_pct,
+    }
+
+
+def _init_sweep_worker(*inputs: object) -> None:
+    global _sweep_worker_inputs
+    _sweep_worker_inputs = cast(_SweepInputs, inputs)
+
+
+def _evaluate_params_in_worker(params: dict[str, float | int]) -> dict[str, float | int]:
+    assert _sweep_worker_inputs is not None
+    rows, markets, replay = _sweep_worker_inputs
+    return _evaluate_params(rows, markets, params, replay)
+
+
 def sweep_parameter_grid(
     rows: list[ReplayRow] | None,
     markets: list[UpDownMarket],
@@ -211,39 +304,36 @@ def sweep_parameter_grid(
     *,
     replay_events: list[dict[str, object]] | None = None,
     order_latency_ms: int = 150,
+    workers: int = 1,
 ) -> tuple[list[dict[str, float | int]], dict[str, dict[str, float]]]:
     keys = ["watch_return_threshold", "hammer_secs", "d_min", "max_entry_price", "fee_bps"]
-    combos = product(*(grid[k] for k in keys))
-
-    report: list[dict[str, float | int]] = []
-    for combo in combos:
-        params: dict[str, float | int] = {
+    param_sets: list[dict[str, float | int]] = [
+        {
             "watch_return_threshold": combo[0],
             "hammer_secs": int(combo[1]),
             "d_min": combo[2],
             "max_entry_price": combo[3],
             "fee_bps": combo[4],
         }
-        if replay_events is None:
-            assert rows is not None
-            result = replay_with_params(rows, markets, params)
-        else:
-            engine = ReplayEngine(markets, order_latency_ms=order_latency_ms)
-            _trades, summary = engine.run(replay_events, params)
-            result = {
-                **params,
-                "closed_markets": len(markets),
-                "trades": summary.trade_count,
-                "win_rate": summary.win_rate,
-                "avg_ev_error": 0.0,
-                "max_drawdown": summary.max_drawdown,
-                "trade_frequency_per_hour": 0.0,
-                "total_pnl": summary.pnl,
-                "avg_fee": summary.avg_fee,
-                "avg_slippage": summary.avg_slippage,
-                "fok_fail_pct": summary.fok_fail_pct,
-            }
-        report.append(result)
+        for combo in product(*(grid[k] for k in keys))
+    ]
+
+    # The token index and the ingested events do not depend on the swept params, so both are built once per grid.
+    replay = None
+    if replay_events is not None:
+        engine = ReplayEngine(markets, order_latency_ms=order_latency_ms)
+        replay = (engine, engine.ingest(replay_events))
+
+    if workers > 1 and len(param_sets) > 1:
+        # Each worker receives the session once via the initializer; only params/results cross per task.
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(param_sets)),
+            initializer=_init_sweep_worker,
+            initargs=(rows, markets, replay),
+        ) as pool:
+            report = list(pool.map(_evaluate_params_in_worker, param_sets))
+    else:
+        report = [_evaluate_params(rows, markets, params, replay) for params in param_sets]
 
     ranked = sorted(
         report,
@@ -285,6 +375,7 @@ def main() -> None:
     parser.add_argument("--output-prefix", required=True, type=Path)
     parser.add_argument("--recorded-session-jsonl", type=Path, default=None)
     parser.add_argument("--order-latency-ms", type=int, default=150)
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for the parameter sweep")
     args = parser.parse_args()
 
     if args.recorded_session_jsonl is None and args.replay_csv is None:
@@ -300,10 +391,11 @@ def main() -> None:
             grid,
             replay_events=events,
             order_latency_ms=args.order_latency_ms,
+            workers=args.workers,
         )
     else:
         rows = load_replay_rows(args.replay_csv)
-        report, robust_ranges = sweep_parameter_grid(rows, markets, grid)
+        report, robust_ranges = sweep_parameter_grid(rows, markets, grid, workers=args.workers)
     export_report(report, robust_ranges, args.output_prefix)
 
 
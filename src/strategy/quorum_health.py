@@ -21,6 +21,20 @@ class QuorumDecision:
     divergence_data_available: bool
 
 
+def _spot_median(prices: list[float]) -> float:
+    count = len(prices)
+    if count == 2:
+        return (prices[0] + prices[1]) / 2
+    if count == 3:
+        a, b, c = prices
+        if a > b:
+            a, b = b, a
+        return float(a if c < a else (c if c < b else b))
+    if count == 1:
+        return float(prices[0])
+    return float(median(prices))
+
+
 class QuorumHealth:
     def __init__(
         self,
@@ -90,7 +104,7 @@ class QuorumHealth:
                 divergence_data_available=False,
             )
 
-        spot_median = float(median(fresh_spot_prices))
+        spot_median = _spot_median(fresh_spot_prices)
         divergence_pct = abs((self.chainlink_sample.price - spot_median) / self.chainlink_sample.price) * 100.0
 
         if divergence_pct > self.divergence_threshold_pct:
@@ -1,14 +1,25 @@
 from __future__ import annotations
 
+import mmap
+import sys
 from bisect import bisect_left
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
 import orjson
 
 from markets.gamma_cache import UpDownMarket
-from strategy.state_machine import StrategyStateMachine
+
+_KIND_PRICE = 0
+_KIND_BOOK = 1
+_KIND_DECISION = 2
+_EVENT_KINDS = {
+    "rtds_price": _KIND_PRICE,
+    "clob_book": _KIND_BOOK,
+    "clob_price_change": _KIND_BOOK,
+    "decision": _KIND_DECISION,
+}
 
 
 @dataclass(slots=True)
@@ -26,21 +37,19 @@ class ReplayTrade:
     failure_type: str | None
     start_price: float
     end_price: float
+    won: bool = field(init=False, repr=False, compare=False)
+    pnl: float = field(init=False, repr=False, compare=False)
 
-    @property
-    def won(self) -> bool:
+    def __post_init__(self) -> None:
         if self.direction == "UP":
-            return self.end_price > self.start_price
-        return self.end_price <= self.start_price
-
-    @property
-    def pnl(self) -> float:
-        if not self.ok:
-            return 0.0
-        payout = 1.0 if self.won else 0.0
-        if self.fill_price is None:
-            return 0.0
-        return payout - self.fill_price - self.fee_cost
+            self.won = self.end_price > self.start_price
+        else:
+            self.won = self.end_price <= self.start_price
+        if not self.ok or self.fill_price is None:
+            self.pnl = 0.0
+        else:
+            payout = 1.0 if self.won else 0.0
+            self.pnl = payout - self.fill_price - self.fee_cost
 
 
 @dataclass(slots=True)
@@ -50,6 +59,17 @@ class BookDepth:
     asks: list[tuple[float, float]]
 
 
+@dataclass(slots=True)
+class ReplaySession:
+    depth_by_token: dict[str, list[BookDepth]]
+    depth_ts_by_token: dict[str, list[float]]
+    price_ts: list[int]
+    price_px: list[float]
+    decisions: list[dict[str, Any]]
+    decision_token_ids: list[str]
+    fills: dict[tuple[str, float, float, float, int], tuple[float | None, float, str | None]] = field(default_factory=dict)
+
+
 @dataclass(slots=True)
 class ReplaySummary:
     pnl: float
@@ -67,57 +87,88 @@ class ReplayEngine:
         self.order_latency_ms = max(0, order_latency_ms)
         self._token_index: dict[str, tuple[UpDownMarket, str]] = {}
         for market in markets:
-            self._token_index[market.up_token_id] = (market, "UP")
-            self._token_index[market.down_token_id] = (market, "DOWN")
+            self._token_index[sys.intern(market.up_token_id)] = (market, "UP")
+            self._token_index[sys.intern(market.down_token_id)] = (market, "DOWN")
 
     def run(
         self,
         events: list[dict[str, Any]],
         params: dict[str, float | int],
+        *,
+        presorted: bool = False,
     ) -> tuple[list[ReplayTrade], ReplaySummary]:
-        sm = StrategyStateMachine(
-            threshold=float(params["watch_return_threshold"]),
-            hammer_secs=int(params["hammer_secs"]),
-            d_min=float(params["d_min"]),
-            max_entry_price=float(params["max_entry_price"]),
-            fee_bps=float(params["fee_bps"]),
-        )
+        return self.evaluate(self.ingest(events, presorted=presorted), params)
 
+    def ingest(self, events: list[dict[str, Any]], *, presorted: bool = False) -> ReplaySession:
         depth_by_token: dict[str, list[BookDepth]] = {}
-        prices: list[tuple[int, float]] = []
+        price_ts: list[int] = []
+        price_px: list[float] = []
         decisions: list[dict[str, Any]] = []
-
-        sorted_events = sorted(events, key=lambda e: (float(e.get("ts", 0.0)), str(e.get("type", ""))))
+        decision_token_ids: list[str] = []
+
+        # Token ids repeat across thousands of events; interning lets every later dict lookup match by identity.
+        intern = sys.intern
+        event_kinds = _EVENT_KINDS
+        price_ts_append = price_ts.append
+        price_px_append = price_px.append
+        decisions_append = decisions.append
+        depth_setdefault = depth_by_token.setdefault
+
+        if presorted or _is_time_ordered(events):
+            sorted_events = events
+        else:
+            sorted_events = sorted(events, key=lambda e: (float(e.get("ts", 0.0)), str(e.get("type", ""))))
         for event in sorted_events:
-            event_type = str(event.get("type", "")).strip().lower()
+            raw_type = event.get("type", "")
+            kind = event_kinds.get(raw_type) if isinstance(raw_type, str) else None
+            if kind is None:
+                kind = event_kinds.get(str(raw_type).strip().lower())
+                if kind is None:
+                    continue
             ts = float(event.get("ts", 0.0))
-            if event_type == "rtds_price":
-                px = float(event["price"])
-                sm.on_price(ts, px, {"source": "chainlink_rtds", "timestamp": event.get("payload_ts", ts)})
-                prices.append((int(ts), px))
-            elif event_type in {"clob_book", "clob_price_change"}:
-                token_id = str(event.get("token_id", ""))
+            if kind == _KIND_PRICE:
+                price_ts_append(int(ts))
+                price_px_append(float(event["price"]))
+            elif kind == _KIND_BOOK:
+                token_id = intern(str(event.get("token_id", "")))
                 if not token_id:
                     continue
                 bids = _normalize_levels(event.get("bids_levels"), fallback_px=event.get("best_bid"))
                 asks = _normalize_levels(event.get("asks_levels"), fallback_px=event.get("best_ask"))
-                depth_by_token.setdefault(token_id, []).append(BookDepth(ts=ts, bids=bids, asks=asks))
-                best_bid = bids[0][0] if bids else None
-                best_ask = asks[0][0] if asks else None
-                bid_size = bids[0][1] if bids else None
-                ask_size = asks[0][1] if asks else None
-                sm.on_book(token_id, best_bid, best_ask, bid_size=bid_size, ask_size=ask_size, ts=ts)
-            elif event_type == "decision":
-                decisions.append(event)
+                depth_setdefault(token_id, []).append(BookDepth(ts=ts, bids=bids, asks=asks))
+            else:
+                decisions_append(event)
+                decision_token_ids.append(intern(str(event.get("token_id", ""))))
+
+        return ReplaySession(
+            depth_by_token=depth_by_token,
+            depth_ts_by_token={token_id: [row.ts for row in rows] for token_id, rows in depth_by_token.items()},
+            price_ts=price_ts,
+            price_px=price_px,
+            decisions=decisions,
+            decision_token_ids=decision_token_ids,
+        )
 
+    def evaluate(
+        self,
+        session: ReplaySession,
+        params: dict[str, float | int],
+    ) -> tuple[list[ReplayTrade], ReplaySummary]:
+        decisions = session.decisions
         if not decisions:
             return [], ReplaySummary(0.0, 0.0, 0, 0.0, 0.0, 0.0, 0.0)
 
-        price_ts = [t for t, _ in prices]
+        depth_by_token = session.depth_by_token
+        depth_ts_by_token = session.depth_ts_by_token
+        price_ts = session.price_ts
+        price_px = session.price_px
+        fills = session.fills
+        latency_ms = self.order_latency_ms
         trades: list[ReplayTrade] = []
+        price_count = len(price_ts)
+        price_bounds: dict[tuple[int, int], tuple[int, int]] = {}
 
-        for dec in decisions:
-            token_id = str(dec.get("token_id", ""))
+        for dec, token_id in zip(decisions, session.decision_token_ids):
             token_row = self._token_index.get(token_id)
             if token_row is None:
                 continue
@@ -132,20 +183,31 @@ class ReplayEngine:
             if fee_cost > 1.0:
                 fee_cost = float(params["fee_bps"]) / 10_000.0
 
-            end_idx = bisect_left(price_ts, market.end_epoch)
-            start_idx = bisect_left(price_ts, market.start_epoch)
-            if end_idx >= len(prices) or start_idx >= len(prices):
+            window = (market.start_epoch, market.end_epoch)
+            bounds = price_bounds.get(window)
+            if bounds is None:
+                bounds = (bisect_left(price_ts, market.start_epoch), bisect_left(price_ts, market.end_epoch))
+                price_bounds[window] = bounds
+            start_idx, end_idx = bounds
+            if end_idx >= price_count or start_idx >= price_count:
                 continue
-            start_price = prices[start_idx][1]
-            end_price = prices[end_idx][1]
-
-            fill_price, slip_cost, failure_type = self._simulate_fill(
-                token_id=token_id,
-                decision_ts=decision_ts,
-                requested_size=requested_size,
-                baseline_ask=ask,
-                depth_by_token=depth_by_token,
-            )
+            start_price = price_px[start_idx]
+            end_price = price_px[end_idx]
+
+            # Fills do not depend on the swept params, so a shared session walks each ladder once.
+            fill_key = (token_id, decision_ts, requested_size, ask, latency_ms)
+            fill = fills.get(fill_key)
+            if fill is None:
+                fill = self._simulate_fill(
+                    token_id=token_id,
+                    decision_ts=decision_ts,
+                    requested_size=requested_size,
+                    baseline_ask=ask,
+                    depth_by_token=depth_by_token,
+                    depth_ts_by_token=depth_ts_by_token,
+                )
+                fills[fill_key] = fill
+            fill_price, slip_cost, failure_type = fill
             trades.append(
                 ReplayTrade(
                     decision_ts=decision_ts,
@@ -174,9 +236,10 @@ class ReplayEngine:
         requested_size: float,
         baseline_ask: float,
         depth_by_token: dict[str, list[BookDepth]],
+        depth_ts_by_token: dict[str, list[float]],
     ) -> tuple[float | None, float, str | None]:
         target_ts = decision_ts + (self.order_latency_ms / 1000.0)
-        ladder = _closest_depth(depth_by_token.get(token_id, []), target_ts)
+        ladder = _closest_depth(depth_by_token.get(token_id, []), depth_ts_by_token.get(token_id, []), target_ts)
         if ladder is None or not ladder.asks:
             return None, 0.0, "missing_book"
 
@@ -196,6 +259,17 @@ class ReplayEngine:
         return fill_price, max(0.0, fill_price - baseline_ask), None
 
 
+def _is_time_ordered(events: list[dict[str, Any]]) -> bool:
+    # Strictly increasing timestamps leave nothing for the (ts, type) sort to reorder.
+    prev = float("-inf")
+    for event in events:
+        ts = float(event.get("ts", 0.0))
+        if not ts > prev:
+            return False
+        prev = ts
+    return True
+
+
 def _normalize_levels(raw_levels: Any, *, fallback_px: Any = None) -> list[tuple[float, float]]:
     levels: list[tuple[float, float]] = []
     if isinstance(raw_levels, list):
@@ -225,55 +299,67 @@ def _normalize_levels(raw_levels: Any, *, fallback_px: Any = None) -> list[tuple
     return levels
 
 
-def _closest_depth(rows: list[BookDepth], target_ts: float) -> BookDepth | None:
+def _closest_depth(rows: list[BookDepth], ts_list: list[float], target_ts: float) -> BookDepth | None:
     if not rows:
         return None
-    return min(rows, key=lambda r: (abs(r.ts - target_ts), r.ts))
-
-
-def _max_drawdown(curve: list[float]) -> float:
-    peak = float("-inf")
-    max_dd = 0.0
-    for val in curve:
-        peak = max(peak, val)
-        max_dd = min(max_dd, val - peak)
-    return abs(max_dd)
+    i = bisect_left(ts_list, target_ts)
+    if i == 0:
+        return rows[0]
+    # Ties go to the earlier snapshot; among equal timestamps, the first one ingested.
+    before = bisect_left(ts_list, ts_list[i - 1], 0, i)
+    if i == len(rows) or (target_ts - ts_list[i - 1]) <= (ts_list[i] - target_ts):
+        return rows[before]
+    return rows[i]
 
 
 def _summarize_trades(trades: list[ReplayTrade]) -> ReplaySummary:
     if not trades:
         return ReplaySummary(0.0, 0.0, 0, 0.0, 0.0, 0.0, 0.0)
     pnl = 0.0
-    curve: list[float] = []
-    ok_trades = [t for t in trades if t.ok]
-    fok_fails = sum(1 for t in trades if t.failure_type == "fok_insufficient_depth")
+    peak = float("-inf")
+    max_dd = 0.0
+    ok_count = 0
+    wins = 0
+    fok_fails = 0
+    fee_total = 0.0
+    slippage_total = 0.0
 
     for trade in trades:
-        pnl += trade.pnl
-        curve.append(pnl)
+        if trade.ok:
+            ok_count += 1
+            wins += trade.won
+            fee_total += trade.fee_cost
+            slippage_total += trade.slippage_cost
+            pnl += trade.pnl
+        if trade.failure_type == "fok_insufficient_depth":
+            fok_fails += 1
+        if pnl > peak:
+            peak = pnl
+        elif pnl - peak < max_dd:
+            max_dd = pnl - peak
 
-    win_rate = (sum(1 for t in ok_trades if t.won) / len(ok_trades)) if ok_trades else 0.0
-    avg_fee = (sum(t.fee_cost for t in ok_trades) / len(ok_trades)) if ok_trades else 0.0
-    avg_slippage = (sum(t.slippage_cost for t in ok_trades) / len(ok_trades)) if ok_trades else 0.0
     return ReplaySummary(
         pnl=pnl,
-        max_drawdown=_max_drawdown(curve),
+        max_drawdown=abs(max_dd),
         trade_count=len(trades),
-        win_rate=win_rate,
-        avg_fee=avg_fee,
-        avg_slippage=avg_slippage,
+        win_rate=(wins / ok_count) if ok_count else 0.0,
+        avg_fee=(fee_total / ok_count) if ok_count else 0.0,
+        avg_slippage=(slippage_total / ok_count) if ok_count else 0.0,
         fok_fail_pct=fok_fails / len(trades),
     )
 
 
 def load_recorded_events(path: Path) -> list[dict[str, Any]]:
-    events: list[dict[str, Any]] = []
-    with path.open("rb") as f:
-        for line in f:
-            if not line.strip():
-                continue
-            payload = orjson.loads(line)
-            if isinstance(payload, dict):
-                events.append(payload)
-    return events
+    loads = orjson.loads
+    with path.open("rb") as handle:
+        try:
+            # Lines are parsed straight out of the page cache instead of a full in-memory copy of the recording.
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            # Empty files, pipes and other unmappable streams go through the buffered handle.
+            payloads = [loads(line) for line in handle if not line.isspace()]
+        else:
+            with mapped:
+                payloads = [loads(line) for line in iter(mapped.readline, b"") if not line.isspace()]
+    return [payload for payload in payloads if isinstance(payload, dict)]
 
@@ -3,7 +3,9 @@ from __future__ import annotations
 import math
 import time
 from collections import deque
+from collections.abc import Iterable
 from dataclasses import dataclass, field
+from typing import cast, final
 
 import structlog
 
@@ -15,6 +17,21 @@ from utils.price_validation import is_price_stale, validate_price_source
 
 logger = structlog.get_logger(__name__)
 
+_SQRT2 = math.sqrt(2)
+_WELFORD_RESYNC_EVERY = 1024
+_FILL_STATS_RESYNC_EVERY = 1024
+# Last value written to the process-wide stale gauge; every write goes through _set_stale_gauge.
+_stale_gauge_value = -1
+# Read-only; a missing timestamp falls back to the tick's own ts.
+_DEFAULT_PRICE_METADATA: dict[str, object] = {"source": "chainlink_rtds"}
+
+
+def _set_stale_gauge(value: int) -> None:
+    global _stale_gauge_value
+    if value != _stale_gauge_value:
+        _stale_gauge_value = value
+        FEED_BLOCKED_STALE_PRICE.set(value)
+
 
 @dataclass(slots=True)
 class Candidate:
@@ -47,6 +64,50 @@ class BookSnapshot:
 @dataclass(slots=True)
 class FillProbStats:
     samples: deque[tuple[float | None, float]] = field(default_factory=lambda: deque(maxlen=50))
+    total_time: float = 0.0
+    same_time: float = 0.0
+    same_count: int = 0
+    timed_pairs: int = 0
+    pushes: int = 0
+
+    def push(self, ask: float | None, ts: float) -> None:
+        samples = self.samples
+        if len(samples) == samples.maxlen:
+            self._apply_pair(samples.popleft(), samples[0], -1)
+        if samples:
+            self._apply_pair(samples[-1], (ask, ts), 1)
+        samples.append((ask, ts))
+        self.pushes += 1
+        if self.pushes >= _FILL_STATS_RESYNC_EVERY:
+            self.rebuild()
+
+    def rebuild(self) -> None:
+        # Running sums drift as pairs are subtracted back out; a periodic recount resets them.
+        self.total_time = 0.0
+        self.same_time = 0.0
+        self.same_count = 0
+        self.timed_pairs = 0
+        self.pushes = 0
+        prev: tuple[float | None, float] | None = None
+        for curr in self.samples:
+            if prev is not None:
+                self._apply_pair(prev, curr, 1)
+            prev = curr
+
+    def _apply_pair(self, prev: tuple[float | None, float], curr: tuple[float | None, float], sign: int) -> None:
+        prev_ask, prev_ts = prev
+        curr_ask, curr_ts = curr
+        if prev_ts is None or curr_ts is None:
+            dt = 1.0
+        else:
+            dt = curr_ts - prev_ts
+            dt = dt if dt > 0.0 else 0.0
+        self.total_time += sign * dt
+        if dt > 0:
+            self.timed_pairs += sign
+        if prev_ask == curr_ask:
+            self.same_time += sign * dt
+            self.same_count += sign
 
 
 @dataclass(slots=True)
@@ -54,6 +115,7 @@ class RollingStats:
     count: int = 0
     mean: float = 0.0
     m2: float = 0.0
+    removals: int = 0
 
     def add(self, value: float) -> None:
         self.count += 1
@@ -78,13 +140,29 @@ class RollingStats:
         self.mean = next_mean
         if self.m2 < 0:
             self.m2 = 0.0
+        self.removals += 1
+
+    def reset(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.removals = 0
+
+    def rebuild(self, values: Iterable[float | None]) -> None:
+        # Reverse Welford updates accumulate rounding error; a periodic forward pass resets it.
+        self.reset()
+        for value in values:
+            if value is not None:
+                self.add(value)
 
     def stddev(self) -> float:
         if self.count <= 0:
             return 0.0
-        return math.sqrt(self.m2 / max(1, self.count - 1))
+        dof = self.count - 1
+        return math.sqrt(self.m2 / (dof if dof > 1 else 1))
 
 
+@final
 class StrategyStateMachine:
     def __init__(
         self,
@@ -139,38 +217,32 @@ class StrategyStateMachine:
         self.rolling_return_stats = RollingStats()
         self.sigma1_window_returns: deque[float | None] = deque(maxlen=60)
         self.sigma1_stats = RollingStats()
+        self._sigma1_value: float | None = None
+        self._sigma_t_by_end: dict[int, float] = {}
         self.books: dict[str, BookSnapshot] = {}
         self.fill_stats: dict[str, FillProbStats] = {}
         self.price_is_stale = False
-        FEED_BLOCKED_STALE_PRICE.set(0)
+        _set_stale_gauge(0)
 
     def _estimate_fill_prob(self, token_id: str, ask: float | None, ts: float | None) -> float | None:
         if ask is None:
             return None
-        stats = self.fill_stats.setdefault(token_id, FillProbStats())
-        stats.samples.append((ask, ts if ts is not None else float(len(stats.samples))))
-        if len(stats.samples) < 2:
+        stats = self.fill_stats.get(token_id)
+        if stats is None:
+            stats = self.fill_stats[token_id] = FillProbStats()
+        stats.push(ask, ts if ts is not None else float(len(stats.samples)))
+        sample_count = len(stats.samples)
+        if sample_count < 2:
             return 0.5
 
-        same_time = 0.0
-        total_time = 0.0
-        rows = list(stats.samples)
-        for idx in range(1, len(rows)):
-            prev_ask, prev_ts = rows[idx - 1]
-            curr_ask, curr_ts = rows[idx]
-            if prev_ts is None or curr_ts is None:
-                dt = 1.0
-            else:
-                dt = max(0.0, curr_ts - prev_ts)
-            total_time += dt
-            if prev_ask == curr_ask:
-                same_time += dt
-
-        if total_time <= 0:
-            stability = sum(1 for i in range(1, len(rows)) if rows[i][0] == rows[i - 1][0]) / (len(rows) - 1)
+        if stats.timed_pairs <= 0:
+            stability = stats.same_count / (sample_count - 1)
         else:
-            stability = same_time / total_time
-        return min(0.95, max(0.05, stability))
+            stability = stats.same_time / stats.total_time
+        # Inline clamps: these run on every book update and builtin min/max calls cost more than the compares.
+        if stability > 0.05:
+            return stability if stability < 0.95 else 0.95
+        return 0.05
 
     def on_book(
         self,
@@ -184,7 +256,9 @@ class StrategyStateMachine:
         bids_levels: list[tuple[float, float]] | None = None,
         asks_levels: list[tuple[float, float]] | None = None,
     ) -> None:
-        snap = self.books.get(token_id, BookSnapshot())
+        snap = self.books.get(token_id)
+        if snap is None:
+            snap = self.books[token_id] = BookSnapshot()
         if bid is not None:
             snap.bid = bid
         if ask is not None:
@@ -204,57 +278,73 @@ class StrategyStateMachine:
 
         inferred_fill_prob = self._estimate_fill_prob(token_id, snap.ask, ts)
         if fill_prob is not None:
-            snap.fill_prob = min(1.0, max(0.0, fill_prob))
+            snap.fill_prob = (fill_prob if fill_prob < 1.0 else 1.0) if fill_prob > 0.0 else 0.0
         elif inferred_fill_prob is not None:
             snap.fill_prob = inferred_fill_prob
 
-        self.books[token_id] = snap
-
     def on_price(self, ts: float, price: float, metadata: dict[str, object] | None = None) -> None:
-        metadata = metadata or {"source": "chainlink_rtds", "timestamp": ts}
+        metadata = metadata or _DEFAULT_PRICE_METADATA
 
-        if not validate_price_source(metadata):
+        # Live and replay feeds tag ticks with a lower-case "chainlink..." source; anything else takes the full check.
+        source = metadata.get("source")
+        if not (isinstance(source, str) and "chainlink" in source) and not validate_price_source(metadata):
             logger.warning("invalid_price_source", metadata=metadata)
             return
-        metadata_ts = float(metadata.get("timestamp", ts))
-        historical_replay = abs(time.time() - float(ts)) > (self.price_stale_after_seconds * 10)
-        stale_by_event_clock = (float(ts) - metadata_ts) > self.price_stale_after_seconds
-        stale_by_wall_clock_eval = is_price_stale(metadata_ts, stale_after_seconds=self.price_stale_after_seconds)
-        stale_by_wall_clock = False if historical_replay else stale_by_wall_clock_eval
+        event_ts = float(ts)
+        stale_after = self.price_stale_after_seconds
+        metadata_ts = float(cast(float, metadata.get("timestamp", ts)))
+        stale_by_event_clock = (event_ts - metadata_ts) > stale_after
+        stale_by_wall_clock_eval = is_price_stale(metadata_ts, stale_after_seconds=stale_after)
+        # Fresh live ticks never need the replay exemption; only a stale verdict pays for a second clock read.
+        stale_by_wall_clock = stale_by_wall_clock_eval and not (abs(time.time() - event_ts) > (stale_after * 10))
         if stale_by_event_clock or stale_by_wall_clock:
             logger.warning("stale_price_update", timestamp=metadata_ts)
             STALE_FEED.inc()
             self.price_is_stale = True
-            FEED_BLOCKED_STALE_PRICE.set(1)
+            _set_stale_gauge(1)
             return
         self.price_is_stale = False
-        FEED_BLOCKED_STALE_PRICE.set(0)
+        # Every tick states its verdict (last writer wins); the mirror only skips writes that change nothing.
+        if _stale_gauge_value != 0:
+            _set_stale_gauge(0)
+        self._sigma1_value = None
+        if self._sigma_t_by_end:
+            self._sigma_t_by_end.clear()
 
         sec = int(ts)
+        prices_1s = self.prices_1s
 
-        if self.prices_1s:
-            prev_price = self.prices_1s[-1][1]
+        rolling_returns = self.rolling_returns
+        rolling_return_stats = self.rolling_return_stats
+
+        if prices_1s:
+            prev_price = prices_1s[-1][1]
             latest_ret = ((price / prev_price) - 1.0) if prev_price > 0 else None
-            self.rolling_returns.append(latest_ret)
+            rolling_returns.append(latest_ret)
             if latest_ret is not None:
-                self.rolling_return_stats.add(latest_ret)
+                rolling_return_stats.add(latest_ret)
 
-            if len(self.sigma1_window_returns) == self.sigma1_window_returns.maxlen:
-                expired_sigma_ret = self.sigma1_window_returns.popleft()
+            sigma1_window_returns = self.sigma1_window_returns
+            if len(sigma1_window_returns) == sigma1_window_returns.maxlen:
+                expired_sigma_ret = sigma1_window_returns.popleft()
                 if expired_sigma_ret is not None:
                     self.sigma1_stats.remove(expired_sigma_ret)
-            self.sigma1_window_returns.append(latest_ret)
+            sigma1_window_returns.append(latest_ret)
             if latest_ret is not None:
                 self.sigma1_stats.add(latest_ret)
+            if self.sigma1_stats.removals >= _WELFORD_RESYNC_EVERY:
+                self.sigma1_stats.rebuild(sigma1_window_returns)
 
-        self.prices_1s.append((sec, price))
+        prices_1s.append((sec, price))
         cutoff = sec - self.rolling_window_seconds
-        while self.prices_1s and self.prices_1s[0][0] < cutoff:
-            self.prices_1s.popleft()
-            if self.rolling_returns:
-                expired_ret = self.rolling_returns.popleft()
+        while prices_1s and prices_1s[0][0] < cutoff:
+            prices_1s.popleft()
+            if rolling_returns:
+                expired_ret = rolling_returns.popleft()
                 if expired_ret is not None:
-                    self.rolling_return_stats.remove(expired_ret)
+                    rolling_return_stats.remove(expired_ret)
+        if rolling_return_stats.removals >= _WELFORD_RESYNC_EVERY:
+            rolling_return_stats.rebuild(rolling_returns)
 
         self.last_price = price
 
@@ -264,34 +354,36 @@ class StrategyStateMachine:
             self.start_prices[300] = price
             self.start_price_metadata[300] = {
                 "price": price,
-                "timestamp": float(metadata.get("timestamp", ts)),
+                "timestamp": metadata_ts,
                 "source": metadata.get("source", "unknown"),
             }
 
-        bucket_15m = sec // 900
-        if bucket_15m != self.last_15m_bucket:
-            self.last_15m_bucket = bucket_15m
-            self.start_prices[900] = price
-            self.start_price_metadata[900] = {
-                "price": price,
-                "timestamp": float(metadata.get("timestamp", ts)),
-                "source": metadata.get("source", "unknown"),
-            }
+            # 15m buckets are unions of 5m buckets, so they can only roll when the 5m bucket does.
+            bucket_15m = bucket_5m // 3
+            if bucket_15m != self.last_15m_bucket:
+                self.last_15m_bucket = bucket_15m
+                self.start_prices[900] = price
+                self.start_price_metadata[900] = {
+                    "price": price,
+                    "timestamp": metadata_ts,
+                    "source": metadata.get("source", "unknown"),
+                }
 
         if self.watch_mode and self.watch_mode_started_at is not None:
             if sec - self.watch_mode_started_at >= self.watch_mode_expiry_seconds:
                 self._set_watch_mode(False, sec)
-                self.prices_1s = deque([(sec, price)], maxlen=max(120, self.rolling_window_seconds * 2))
-                self.rolling_returns = deque()
-                self.rolling_return_stats = RollingStats()
-                self.sigma1_window_returns = deque(maxlen=60)
-                self.sigma1_stats = RollingStats()
+                prices_1s.clear()
+                prices_1s.append((sec, price))
+                rolling_returns.clear()
+                rolling_return_stats.reset()
+                self.sigma1_window_returns.clear()
+                self.sigma1_stats.reset()
                 return
 
-        if len(self.prices_1s) < 2:
+        if len(prices_1s) < 2:
             return
 
-        first_price = self.prices_1s[0][1]
+        first_price = prices_1s[0][1]
         rolling_abs_ret = abs((price / first_price) - 1) if first_price > 0 else 0.0
         trigger_by_return = rolling_abs_ret >= self.threshold
 
@@ -329,16 +421,24 @@ class StrategyStateMachine:
         return 0 <= (end_epoch - now_ts) <= self.hammer_secs
 
     def _sigma1(self) -> float:
-        if len(self.prices_1s) < 61:
-            return 0.0
-        if self.sigma1_stats.count <= 0:
-            return 0.0
-        return math.sqrt(max((self.sigma1_stats.m2 / max(1, self.sigma1_stats.count - 1)), 1e-12))
+        # Every candidate in a pick_best pass asks for this; it only changes on an accepted price update.
+        cached = self._sigma1_value
+        if cached is not None:
+            return cached
+        stats = self.sigma1_stats
+        if len(self.prices_1s) < 61 or stats.count <= 0:
+            sigma1 = 0.0
+        else:
+            dof = stats.count - 1
+            var = stats.m2 / (dof if dof > 1 else 1)
+            sigma1 = math.sqrt(1e-12 if var < 1e-12 else var)
+        self._sigma1_value = sigma1
+        return sigma1
 
     @staticmethod
-    def _normal_cdf(x: float) -> float:
-        return 0.5 * (1 + math.erf(x / math.sqrt(2)))
-
+    def _upper_tail(x: float) -> float:
+        # P(Z > x) via erfc keeps precision in both tails, unlike 1 - Phi(x).
+        return 0.5 * math.erfc(x / _SQRT2)
 
     @staticmethod
     def vwap_to_fill(size: float, asks_levels: list[tuple[float, float]]) -> float | None:
@@ -352,16 +452,23 @@ class StrategyStateMachine:
         for price, level_size in asks_levels:
             if price <= 0 or level_size <= 0:
                 continue
-            take = min(remaining, level_size)
-            notional += take * price
-            remaining -= take
+            # The level that completes the fill is priced directly; only fully consumed levels touch the running totals.
+            if level_size >= remaining:
+                return (notional + remaining * price) / size
+            notional += level_size * price
+            remaining -= level_size
             if remaining <= 1e-12:
                 return notional / size
         return None
 
     def _buy_fee_cost_per_share(self, *, ask: float, fee_rate_bps: float) -> float:
         fee_rate = fee_rate_bps / 10_000.0
-        p = min(max(ask, 1e-9), 1 - 1e-9)
+        if ask < 1e-9:
+            p = 1e-9
+        elif ask > 1 - 1e-9:
+            p = 1 - 1e-9
+        else:
+            p = ask
         return p * fee_rate * ((p * (1 - p)) ** self.fee_formula_exponent)
 
     def _candidate_ev(
@@ -393,20 +500,30 @@ class StrategyStateMachine:
             return None
 
         sigma1 = self._sigma1()
-        secs = max(1, market.end_epoch - int(self.prices_1s[-1][0]))
-        sigma_t = sigma1 * math.sqrt(secs)
+        if sigma1 <= 0:
+            return None
+        # UP and DOWN tokens of a market (and markets sharing an end) reuse the horizon sigma until the next tick.
+        end_epoch = market.end_epoch
+        sigma_t = self._sigma_t_by_end.get(end_epoch)
+        if sigma_t is None:
+            secs = end_epoch - int(self.prices_1s[-1][0])
+            if secs < 1:
+                secs = 1
+            sigma_t = self._sigma_t_by_end[end_epoch] = sigma1 * math.sqrt(secs)
         if sigma_t <= 0:
             return None
 
         z_up = (start - curr) / (curr * sigma_t)
-        p_up = 1 - self._normal_cdf(z_up)
-        raw_p_hat = p_up if direction == "UP" else 1 - p_up
         z_directional = -z_up if direction == "UP" else z_up
+        raw_p_hat = self._upper_tail(-z_directional)
 
-        if self.calibration_input == "z_score":
-            p_hat = self.probability_calibrator.calibrate(z_directional)
+        calibration_value = z_directional if self.calibration_input == "z_score" else raw_p_hat
+        calibrator = self.probability_calibrator
+        if type(calibrator) is IdentityCalibrator:
+            # Inlined IdentityCalibrator.calibrate; the clamp also maps a NaN input to 0.0.
+            p_hat = (calibration_value if calibration_value < 1.0 else 1.0) if calibration_value > 0.0 else 0.0
         else:
-            p_hat = self.probability_calibrator.calibrate(raw_p_hat)
+            p_hat = calibrator.calibrate(calibration_value)
 
         fee_bps: float | None = None
         if self.enable_fee_rate and token_id and self.token_metadata_cache is not None:
@@ -421,23 +538,28 @@ class StrategyStateMachine:
             fee_bps = self.default_fee_rate_bps if self.enable_fee_rate else self.fee_bps
 
         required_shares = expected_size if expected_size is not None else (self.expected_notional_usd / ask)
-        required_shares = max(0.0, required_shares)
+        required_shares = required_shares if required_shares > 0.0 else 0.0
         vwap_price = self.vwap_to_fill(required_shares, asks_levels or [])
         if vwap_price is None:
             slippage_cost = 0.0
             can_fill = False
         else:
-            slippage_cost = max(0.0, vwap_price - ask)
+            slippage_cost = vwap_price - ask if vwap_price > ask else 0.0
             can_fill = True
 
-        effective_fill_prob = 1.0 if fill_prob is None else min(1.0, max(0.0, fill_prob))
+        if fill_prob is None:
+            effective_fill_prob = 1.0
+        else:
+            effective_fill_prob = (fill_prob if fill_prob < 1.0 else 1.0) if fill_prob > 0.0 else 0.0
         if not can_fill:
             effective_fill_prob = 0.0
         order_size = required_shares * ask
-        ev_before_fees = (p_hat - ask - slippage_cost) * effective_fill_prob
-        fee_cost = (fee_bps / 10_000.0) * order_size
+        edge = p_hat - ask - slippage_cost
+        fee_frac = fee_bps / 10_000.0
+        ev_before_fees = edge * effective_fill_prob
+        fee_cost = fee_frac * order_size
         ev = ev_before_fees - fee_cost
-        ev_exec = (p_hat - ask - slippage_cost) - ((fee_bps / 10_000.0) * ask)
+        ev_exec = edge - (fee_frac * ask)
         return Candidate(
             market=market,
             direction=direction,
@@ -457,24 +579,25 @@ class StrategyStateMachine:
     def pick_best(
         self,
         now_ts: int,
-        markets: list[UpDownMarket],
+        markets: Iterable[UpDownMarket],
         token_map: dict[str, str],
     ) -> Candidate | None:
-        if self.price_is_stale:
+        if self.price_is_stale or self.last_price is None:
             return None
-        candidates: list[Candidate] = []
+        books = self.books
+        hammer_secs = self.hammer_secs
+        best: Candidate | None = None
         for market in markets:
-            if not self.in_hammer_window(now_ts, market.end_epoch):
+            if not 0 <= (market.end_epoch - now_ts) <= hammer_secs:
                 continue
             for direction, tid in (("UP", market.up_token_id), ("DOWN", market.down_token_id)):
-                book = self.books.get(tid, BookSnapshot())
-                ask = book.ask
-                if ask is None:
+                book = books.get(tid)
+                if book is None or book.ask is None:
                     continue
                 cand = self._candidate_ev(
                     market,
                     direction,
-                    ask,
+                    book.ask,
                     bid=book.bid,
                     ask_size=book.ask_size,
                     fill_prob=book.fill_prob,
@@ -483,12 +606,12 @@ class StrategyStateMachine:
                 )
                 if cand:
                     cand.token_id = tid
-                    candidates.append(cand)
+                    if best is None or cand.ev > best.ev:
+                        best = cand
 
-        if not candidates:
+        if best is None:
             return None
 
-        best = max(candidates, key=lambda c: c.ev)
         logger.info(
             "best_candidate_selected",
             token_id=best.token_id,
@@ -9,10 +9,13 @@ logger = structlog.get_logger(__name__)
 
 def validate_price_source(price_data: dict[str, object]) -> bool:
     """Return True only when the feed/source metadata indicates Chainlink."""
-    source = str(price_data.get("source") or price_data.get("feed") or "").lower()
-    market = str(price_data.get("market") or "").lower()
-    topic = str(price_data.get("topic") or "").lower()
-    return "chainlink" in source or "chainlink" in market or "chainlink" in topic
+    if "chainlink" in str(price_data.get("source") or price_data.get("feed") or "").lower():
+        return True
+    for key in ("market", "topic"):
+        value = price_data.get(key)
+        if value and "chainlink" in str(value).lower():
+            return True
+    return False
 
 
 def compare_feeds(chainlink_price: float, binance_price: float) -> float:
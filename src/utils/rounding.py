@@ -2,26 +2,71 @@ from __future__ import annotations
 
 import math
 
+# Inputs within this relative distance of a grid point are treated as on the grid.
+_GRID_SNAP_TOLERANCE = 1e-12
+# step -> integer steps per unit, or 0 when 1/step is not integral.
+_GRID_SCALES: dict[float, int] = {}
+
+
+def _grid_scale(step: float) -> int:
+    scale = round(1.0 / step)
+    if scale < 1 or scale > 10**8 or abs(scale * step - 1.0) > 1e-9:
+        scale = 0
+    if len(_GRID_SCALES) < 64:
+        _GRID_SCALES[step] = scale
+    return scale
+
+
+def _floor_to_grid(value: float, step: float) -> float:
+    """Floor value onto the step grid in integer grid units.
+
+    On-grid inputs come back unchanged even when value * scale lands an ulp below the integer
+    (0.47 at tick 0.01 stays 0.47), and results are the nearest double to the decimal grid price.
+    """
+    scale = _GRID_SCALES.get(step)
+    if scale is None:
+        scale = _grid_scale(step)
+    if not scale:
+        return round(math.floor(value / step) * step, 8)
+    scaled = value * scale
+    units = math.floor(scaled)
+    if scaled - units >= 1.0 - _GRID_SNAP_TOLERANCE * (scaled if scaled > 1.0 else 1.0):
+        units += 1
+    return units / scale
+
+
+def _ceil_to_grid(value: float, step: float) -> float:
+    scale = _GRID_SCALES.get(step)
+    if scale is None:
+        scale = _grid_scale(step)
+    if not scale:
+        return round(math.ceil(value / step) * step, 8)
+    scaled = value * scale
+    units = math.ceil(scaled)
+    if units - scaled >= 1.0 - _GRID_SNAP_TOLERANCE * (scaled if scaled > 1.0 else 1.0):
+        units -= 1
+    return units / scale
+
 
 def round_price_to_tick(price: float, tick_size: float) -> float:
     if tick_size <= 0:
         raise ValueError("tick_size must be > 0")
-    return round(math.floor(price / tick_size) * tick_size, 8)
+    return _floor_to_grid(price, tick_size)
 
 
 def round_price_up_to_tick(price: float, tick_size: float) -> float:
     if tick_size <= 0:
         raise ValueError("tick_size must be > 0")
-    return round(math.ceil(price / tick_size) * tick_size, 8)
+    return _ceil_to_grid(price, tick_size)
 
 
 def round_price_down_to_tick(price: float, tick_size: float) -> float:
     if tick_size <= 0:
         raise ValueError("tick_size must be > 0")
-    return round(math.floor(price / tick_size) * tick_size, 8)
+    return _floor_to_grid(price, tick_size)
 
 
 def round_size_to_step(size: float, step_size: float) -> float:
     if step_size <= 0:
         raise ValueError("step_size must be > 0")
-    return round(math.floor(size / step_size) * step_size, 8)
+    return _floor_to_grid(size, step_size)
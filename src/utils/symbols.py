@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from functools import lru_cache
 
 _KNOWN_QUOTES: tuple[str, ...] = ("usdt", "usdc", "usd", "eur", "gbp")
 
 
+@lru_cache(maxsize=512)
 def normalize_symbol(symbol: str) -> str:
     """Normalize symbol text to `base/quote` lowercase form."""
     value = symbol.strip().lower()
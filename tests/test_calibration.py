@@ -1,7 +1,7 @@
 from pathlib import Path
 
 from markets.gamma_cache import UpDownMarket
-from strategy.calibration import IdentityCalibrator, IsotonicCalibrator, load_probability_calibrator
+from strategy.calibration import IdentityCalibrator, IsotonicCalibrator, LogisticCalibrator, load_probability_calibrator
 from strategy.state_machine import StrategyStateMachine
 
 
@@ -16,6 +16,17 @@ def test_isotonic_output_is_monotonic() -> None:
     assert outputs == sorted(outputs)
 
 
+def test_calibrate_many_matches_scalar_calibrate() -> None:
+    values = [-0.5, 0.0, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5]
+    calibrators = [
+        IdentityCalibrator(),
+        LogisticCalibrator(coef=2.0, intercept=-0.5),
+        IsotonicCalibrator(x=[0.0, 0.5, 1.0], y=[0.1, 0.4, 0.9]),
+    ]
+    for calibrator in calibrators:
+        assert calibrator.calibrate_many(values) == [calibrator.calibrate(v) for v in values]
+
+
 def test_missing_isotonic_params_falls_back_to_identity(tmp_path: Path) -> None:
     missing_path = tmp_path / "missing.json"
     calibrator = load_probability_calibrator(
@@ -49,3 +60,33 @@ def test_candidate_ev_uses_calibrated_probability() -> None:
     assert candidate is not None
     assert candidate.p_hat == 0.2
     assert candidate.ev == 0.1
+
+
+def test_identity_calibration_clamps_nan_probability() -> None:
+    sm = StrategyStateMachine(0.005, hammer_secs=15, d_min=1.0, max_entry_price=0.99, fee_bps=0)
+    t0 = 1_710_000_000
+    for i in range(61):
+        sm.on_price(t0 + i, 50_000.0 + (i % 2) * 20)
+
+    sm.start_prices[300] = float("nan")
+    market = UpDownMarket("m5", t0 - 285, t0 + 15, "u5", "d5", 5)
+    candidate = sm._candidate_ev(market, "UP", ask=0.1, asks_levels=[(0.1, 100.0)])
+
+    assert candidate is not None
+    assert candidate.p_hat == 0.0
+
+
+def test_calibrator_swapped_after_construction_is_used() -> None:
+    sm = StrategyStateMachine(0.005, hammer_secs=15, d_min=1.0, max_entry_price=0.99, fee_bps=0)
+    t0 = 1_710_000_000
+    base = 50_000.0
+    for i in range(61):
+        sm.on_price(t0 + i, base + i * 2)
+
+    sm.start_prices[300] = base - 100
+    sm.probability_calibrator = ConstantCalibrator()
+    market = UpDownMarket("m5", t0 - 285, t0 + 15, "u5", "d5", 5)
+    candidate = sm._candidate_ev(market, "UP", ask=0.1, asks_levels=[(0.1, 100.0)])
+
+    assert candidate is not None
+    assert candidate.p_hat == 0.2
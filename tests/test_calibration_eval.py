@@ -0,0 +1,30 @@
+import pytest
+
+from strategy.calibration_eval import brier_score, calibration_curve
+
+
+def test_brier_score_matches_mean_squared_error() -> None:
+    assert brier_score([0.9, 0.2, 0.5, 1.0], [1, 0, 1, 1]) == pytest.approx((0.01 + 0.04 + 0.25 + 0.0) / 4)
+
+
+def test_brier_score_handles_non_binary_outcomes() -> None:
+    assert brier_score([0.5, 0.5], [2, 0]) == pytest.approx(1.25)
+
+
+def test_brier_score_keeps_precision_for_near_perfect_forecasts() -> None:
+    probabilities = [1e-9, 1.0] + [0.999999] * 1_000
+    outcomes = [0, 1] + [1] * 1_000
+    direct = sum((p - y) ** 2 for p, y in zip(probabilities, outcomes)) / len(probabilities)
+
+    assert brier_score([1e-9, 1.0], [0, 1]) == pytest.approx(5e-19, rel=1e-12, abs=0.0)
+    assert brier_score(probabilities, outcomes) == pytest.approx(direct, rel=1e-12, abs=0.0)
+
+
+def test_calibration_curve_bins_clamped_predictions() -> None:
+    rows = calibration_curve([-0.1, 0.05, 0.45, 0.55, 1.2], [0, 1, 0, 1, 1], bins=2)
+
+    assert [(row.bin_start, row.bin_end, row.count) for row in rows] == [(0.0, 0.5, 3), (0.5, 1.0, 2)]
+    assert rows[0].mean_predicted == pytest.approx(0.5 / 3)
+    assert rows[0].empirical_rate == pytest.approx(1 / 3)
+    assert rows[1].mean_predicted == pytest.approx(0.775)
+    assert rows[1].empirical_rate == 1.0
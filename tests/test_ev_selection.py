@@ -1,6 +1,7 @@
 import pytest
 from markets.gamma_cache import UpDownMarket
 from markets.token_metadata_cache import TokenMetadata, TokenMetadataCache
+from metrics import FEED_BLOCKED_STALE_PRICE
 from strategy.state_machine import StrategyStateMachine
 
 
@@ -266,3 +267,75 @@ def test_stale_price_blocks_candidate_selection() -> None:
 
     assert sm.price_is_stale
     assert sm.pick_best(t0, [market], {}) is None
+
+
+def test_stale_gauge_follows_the_latest_verdict_across_instances() -> None:
+    t0 = 1_710_000_000
+    stale_meta = {"source": "chainlink_rtds", "timestamp": t0}
+    live = StrategyStateMachine(0.005, hammer_secs=15, d_min=1.0, max_entry_price=0.99, fee_bps=0)
+    live.on_price(t0, 100.0, metadata=stale_meta)
+    live.on_price(t0 + 10, 100.1, metadata=stale_meta)
+    assert FEED_BLOCKED_STALE_PRICE._value.get() == 1
+
+    other = StrategyStateMachine(0.005, hammer_secs=15, d_min=1.0, max_entry_price=0.99, fee_bps=0)
+    assert FEED_BLOCKED_STALE_PRICE._value.get() == 0
+
+    live.on_price(t0 + 11, 100.2, metadata=stale_meta)
+    assert FEED_BLOCKED_STALE_PRICE._value.get() == 1
+
+    # A fresh tick on any instance clears a gauge another instance set.
+    other.on_price(t0 + 20, 100.3, metadata={"source": "chainlink_rtds", "timestamp": t0 + 20})
+    assert not other.price_is_stale
+    assert FEED_BLOCKED_STALE_PRICE._value.get() == 0
+
+    other.on_price(t0 + 30, 100.4, metadata={"source": "chainlink_rtds", "timestamp": t0 + 20})
+    assert FEED_BLOCKED_STALE_PRICE._value.get() == 1
+    live.on_price(t0 + 31, 100.5, metadata={"source": "chainlink_rtds", "timestamp": t0 + 31})
+    assert FEED_BLOCKED_STALE_PRICE._value.get() == 0
+
+
+def test_upper_tail_probability_keeps_precision_far_from_the_money() -> None:
+    far_tail = StrategyStateMachine._upper_tail(9.0)
+
+    assert 0.0 < far_tail == pytest.approx(1.1285884059538e-19, rel=1e-9)
+    assert StrategyStateMachine._upper_tail(-9.0) == 1.0
+    assert StrategyStateMachine._upper_tail(0.0) == 0.5
+
+
+def test_inferred_fill_probability_tracks_the_recent_ask_window() -> None:
+    sm = StrategyStateMachine(0.005, hammer_secs=15, d_min=1.0, max_entry_price=0.99, fee_bps=0)
+    t0 = 1_710_000_000
+
+    for i in range(1_100):
+        sm.on_book("u5", 0.39, 0.40 if i % 2 else 0.41, ts=t0 + i)
+    assert sm.books["u5"].fill_prob == 0.05
+
+    for i in range(1_100, 1_125):
+        sm.on_book("u5", 0.39, 0.40, ts=t0 + i)
+    assert sm.books["u5"].fill_prob == pytest.approx(25 / 49)
+
+
+def test_horizon_sigma_memo_is_refreshed_by_the_next_tick() -> None:
+    def _build() -> StrategyStateMachine:
+        sm = StrategyStateMachine(0.5, hammer_secs=15, d_min=1.0, max_entry_price=0.99, fee_bps=0)
+        for i in range(61):
+            sm.on_price(t0 + i, 50_000.0 + (i % 2) * 20)
+        sm.start_prices[300] = 49_990.0
+        return sm
+
+    t0 = 1_710_000_000
+    market = UpDownMarket("m5", t0 - 285, t0 + 15, "u5", "d5", 5)
+    sm = _build()
+
+    before = sm._candidate_ev(market, "UP", ask=0.4, asks_levels=[(0.4, 10.0)])
+    sm.on_price(t0 + 61, 50_040.0)
+    after = sm._candidate_ev(market, "UP", ask=0.4, asks_levels=[(0.4, 10.0)])
+
+    fresh = _build()
+    fresh.on_price(t0 + 61, 50_040.0)
+    expected = fresh._candidate_ev(market, "UP", ask=0.4, asks_levels=[(0.4, 10.0)])
+
+    assert before is not None and after is not None and expected is not None
+    assert 0.0 < before.p_hat < 1.0
+    assert after.p_hat != before.p_hat
+    assert after.p_hat == expected.p_hat
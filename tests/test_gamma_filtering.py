@@ -1,5 +1,10 @@
 from __future__ import annotations
 
+import asyncio
+
+import pytest
+
+from config import banned_categories_for_jurisdiction
 from markets.gamma_cache import GammaCache, UpDownMarket
 
 
@@ -28,3 +33,44 @@ def test_filter_markets_by_banned_categories_excludes_sports() -> None:
     allowed = GammaCache.filter_markets_by_banned_categories([sports_market, event_market], {"sports"})
 
     assert [m.slug for m in allowed] == ["event"]
+
+
+def test_market_category_is_normalized_at_construction() -> None:
+    market = UpDownMarket("m", 0, 1, "u", "d", 5, category="  Sports ")
+
+    assert market.category == "sports"
+    assert GammaCache.filter_markets_by_banned_categories([market], banned_categories_for_jurisdiction("us")) == []
+
+
+def test_banned_categories_for_jurisdiction_merges_default_and_normalizes() -> None:
+    assert banned_categories_for_jurisdiction("us-nj") == frozenset({"sports"})
+    assert banned_categories_for_jurisdiction("unknown") == frozenset()
+
+
+def test_cancelled_fetch_owner_does_not_cancel_concurrent_waiters(monkeypatch) -> None:
+    cache = GammaCache("https://gamma.example")
+    calls: list[str] = []
+    owner_started = asyncio.Event()
+    market = UpDownMarket("btc-updown-5m-300", 300, 600, "u", "d", 5)
+
+    async def _fake_fetch(slug: str, horizon_minutes: int, start_epoch: int) -> UpDownMarket:
+        calls.append(slug)
+        if len(calls) == 1:
+            owner_started.set()
+            await asyncio.sleep(3600)
+        return market
+
+    monkeypatch.setattr(cache, "_fetch_market", _fake_fetch)
+
+    async def _run() -> UpDownMarket:
+        owner = asyncio.create_task(cache.get_market(5, 300))
+        await owner_started.wait()
+        waiter = asyncio.create_task(cache.get_market(5, 300))
+        await asyncio.sleep(0)
+        owner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        return await waiter
+
+    assert asyncio.run(_run()) is market
+    assert len(calls) == 2
@@ -53,6 +53,24 @@ def test_reject_expired_market() -> None:
         GammaCache._validate_market_row(row, build_slug(5, start), 5, start)
 
 
+def test_validate_market_row_parses_utc_timestamp_variants() -> None:
+    start = (int(time.time()) // 300 + 288) * 300
+    slug = build_slug(5, start)
+    base = _valid_row(start, 5)
+    end_z = str(base["endDate"])
+    variants = (
+        (str(base["startDate"]), end_z),
+        (str(base["startDate"]).replace("Z", ".000Z"), end_z.replace("Z", ".000Z")),
+        (str(base["startDate"]).replace("Z", "+00:00"), end_z.replace("Z", "+00:00")),
+        (str(base["startDate"]).replace("Z", "+02:00"), end_z.replace("Z", "+02:00")),
+    )
+    for start_iso, end_iso in variants:
+        row = dict(base, startDate=start_iso, endDate=end_iso)
+        observed_start, observed_end = GammaCache._validate_market_row(row, slug, 5, start)
+        offset = 7200 if start_iso.endswith("+02:00") else 0
+        assert (observed_start, observed_end) == (start - offset, start + 300 - offset)
+
+
 def test_cache_hit_behavior() -> None:
     gc = GammaCache("https://gamma-api.polymarket.com")
     start = int(time.time()) + 300
@@ -66,6 +84,36 @@ def test_cache_hit_behavior() -> None:
     assert cached[1] == market.end_epoch
 
 
+def test_cache_evicts_expired_and_least_recently_used_entries() -> None:
+    gc = GammaCache("https://gamma-api.polymarket.com", max_entries=2)
+    now = int(time.time())
+    expired = UpDownMarket("expired", now - 600, now - 300, "u0", "d0", 5)
+    gc._cache[expired.slug] = (expired, expired.end_epoch)
+
+    markets = [UpDownMarket(f"m{i}", now + i * 300, now + (i + 1) * 300, f"u{i}", f"d{i}", 5) for i in range(1, 4)]
+    gc._store(markets[0].slug, markets[0])
+    assert list(gc._cache) == ["m1"]
+
+    gc._store(markets[1].slug, markets[1])
+    gc._cache.move_to_end("m1")
+    gc._store(markets[2].slug, markets[2])
+    assert list(gc._cache) == ["m1", "m3"]
+
+
+def test_cache_evicts_expired_entries_before_live_ones_when_full() -> None:
+    gc = GammaCache("https://gamma-api.polymarket.com", max_entries=2)
+    now = int(time.time())
+    live = UpDownMarket("live", now, now + 300, "u0", "d0", 5)
+    expired = UpDownMarket("expired", now - 600, now - 300, "u1", "d1", 5)
+    gc._cache[live.slug] = (live, live.end_epoch)
+    gc._cache[expired.slug] = (expired, expired.end_epoch)
+
+    fresh = UpDownMarket("fresh", now + 300, now + 600, "u2", "d2", 5)
+    gc._store(fresh.slug, fresh)
+
+    assert list(gc._cache) == ["live", "fresh"]
+
+
 def test_get_market_reuses_single_client_session(monkeypatch: pytest.MonkeyPatch) -> None:
     now = int(time.time())
     start_1 = ((now // 300) + 2) * 300
@@ -91,11 +139,11 @@ def test_get_market_reuses_single_client_session(monkeypatch: pytest.MonkeyPatch
         def raise_for_status(self) -> None:
             return
 
-        async def json(self) -> list[dict[str, object]]:
+        async def json(self, **_kwargs: object) -> list[dict[str, object]]:
             return self._rows
 
     class FakeSession:
-        def __init__(self) -> None:
+        def __init__(self, **_kwargs: object) -> None:
             self.closed = False
             self.get_calls = 0
 
@@ -108,7 +156,7 @@ def test_get_market_reuses_single_client_session(monkeypatch: pytest.MonkeyPatch
         async def close(self) -> None:
             self.closed = True
 
-    def make_session() -> FakeSession:
+    def make_session(**_kwargs: object) -> FakeSession:
         session = FakeSession()
         created_sessions.append(session)
         return session
@@ -130,6 +178,110 @@ def test_get_market_reuses_single_client_session(monkeypatch: pytest.MonkeyPatch
     assert created_sessions[0].closed is True
 
 
+def test_get_market_deduplicates_concurrent_fetches(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = int(time.time())
+    start = ((now // 300) + 2) * 300
+    row = _valid_row(start, 5)
+
+    class FakeResponse:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        def raise_for_status(self) -> None:
+            return
+
+        async def json(self, **_kwargs: object) -> list[dict[str, object]]:
+            await asyncio.sleep(0)
+            return [row]
+
+    class FakeSession:
+        def __init__(self, **_kwargs: object) -> None:
+            self.closed = False
+            self.get_calls = 0
+
+        def get(self, _url: str, *, params: dict[str, str], timeout: int):
+            del params, timeout
+            self.get_calls += 1
+            return FakeResponse()
+
+        async def close(self) -> None:
+            self.closed = True
+
+    session = FakeSession()
+    monkeypatch.setattr("markets.gamma_cache.aiohttp.ClientSession", lambda **_kwargs: session)
+
+    async def _run() -> list[UpDownMarket]:
+        cache = GammaCache("https://gamma-api.polymarket.com")
+        try:
+            markets = await asyncio.gather(*[cache.get_market(5, start) for _ in range(3)])
+            assert cache._inflight == {}
+            return markets
+        finally:
+            await cache.close()
+
+    markets = asyncio.run(_run())
+
+    assert session.get_calls == 1
+    assert markets[0] is markets[1] is markets[2]
+
+
+def test_prefetch_warms_cache_in_background(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = int(time.time())
+    start = ((now // 300) + 2) * 300
+    rows_by_slug = {build_slug(5, start): [_valid_row(start, 5)]}
+
+    class FakeResponse:
+        def __init__(self, rows: list[dict[str, object]]) -> None:
+            self._rows = rows
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+        def raise_for_status(self) -> None:
+            return
+
+        async def json(self, **_kwargs: object) -> list[dict[str, object]]:
+            return self._rows
+
+    class FakeSession:
+        def __init__(self, **_kwargs: object) -> None:
+            self.closed = False
+
+        def get(self, _url: str, *, params: dict[str, str], timeout: int):
+            del timeout
+            return FakeResponse(rows_by_slug.get(params["slug"], []))
+
+        async def close(self) -> None:
+            self.closed = True
+
+    monkeypatch.setattr("markets.gamma_cache.aiohttp.ClientSession", FakeSession)
+
+    async def _run() -> GammaCache:
+        cache = GammaCache("https://gamma-api.polymarket.com")
+        try:
+            cache.prefetch(5, [start])
+            cache.prefetch(5, [start + 300])
+            assert len(cache._prefetch_tasks) == 2
+            while cache._prefetch_tasks:
+                await asyncio.sleep(0)
+            cache.prefetch(5, [start + 300])
+            assert not cache._prefetch_tasks
+        finally:
+            await cache.close()
+        return cache
+
+    cache = asyncio.run(_run())
+
+    assert build_slug(5, start) in cache._cache
+    assert build_slug(5, start + 300) not in cache._cache
+
+
 def test_get_market_allows_start_time_drift_when_slug_matches(monkeypatch: pytest.MonkeyPatch) -> None:
     now = int(time.time())
     start = ((now // 300) + 3) * 300
@@ -146,11 +298,11 @@ def test_get_market_allows_start_time_drift_when_slug_matches(monkeypatch: pytes
         def raise_for_status(self) -> None:
             return
 
-        async def json(self) -> list[dict[str, object]]:
+        async def json(self, **_kwargs: object) -> list[dict[str, object]]:
             return [row]
 
     class FakeSession:
-        def __init__(self) -> None:
+        def __init__(self, **_kwargs: object) -> None:
             self.closed = False
 
         def get(self, _url: str, *, params: dict[str, str], timeout: int):
@@ -190,11 +342,11 @@ def test_get_market_accepts_list_payloads_for_outcomes_and_clob_ids(monkeypatch:
         def raise_for_status(self) -> None:
             return
 
-        async def json(self) -> list[dict[str, object]]:
+        async def json(self, **_kwargs: object) -> list[dict[str, object]]:
             return [row]
 
     class FakeSession:
-        def __init__(self) -> None:
+        def __init__(self, **_kwargs: object) -> None:
             self.closed = False
 
         def get(self, _url: str, *, params: dict[str, str], timeout: int):
@@ -235,11 +387,11 @@ def test_get_market_accepts_json_string_payloads_for_outcomes_and_clob_ids(monke
         def raise_for_status(self) -> None:
             return
 
-        async def json(self) -> list[dict[str, object]]:
+        async def json(self, **_kwargs: object) -> list[dict[str, object]]:
             return [row]
 
     class FakeSession:
-        def __init__(self) -> None:
+        def __init__(self, **_kwargs: object) -> None:
             self.closed = False
 
         def get(self, _url: str, *, params: dict[str, str], timeout: int):
@@ -279,11 +431,11 @@ def test_get_market_raises_deterministic_error_for_malformed_outcomes_json(monke
         def raise_for_status(self) -> None:
             return
 
-        async def json(self) -> list[dict[str, object]]:
+        async def json(self, **_kwargs: object) -> list[dict[str, object]]:
             return [row]
 
     class FakeSession:
-        def __init__(self) -> None:
+        def __init__(self, **_kwargs: object) -> None:
             self.closed = False
 
         def get(self, _url: str, *, params: dict[str, str], timeout: int):
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import importlib
+
+import pytest
+
+import metrics
+
+
+def test_reimporting_metrics_reuses_registered_collectors() -> None:
+    trades = metrics.TRADES
+    trading_allowed = metrics.TRADING_ALLOWED
+
+    reloaded = importlib.reload(metrics)
+
+    assert reloaded.TRADES is trades
+    assert reloaded.TRADING_ALLOWED is trading_allowed
+
+
+def test_registering_a_name_with_a_different_metric_type_raises() -> None:
+    with pytest.raises(ValueError, match="bot_trades_total"):
+        metrics._gauge("bot_trades_total", metrics.TRADES._documentation)
+
+
+def test_registering_a_name_with_different_labels_raises() -> None:
+    with pytest.raises(ValueError, match="bot_trades_total"):
+        metrics._counter("bot_trades_total", metrics.TRADES._documentation, ["side"])
@@ -60,3 +60,21 @@ def test_sweep_and_export_reports(tmp_path: Path) -> None:
 
     assert output_prefix.with_suffix(".json").exists()
     assert output_prefix.with_suffix(".csv").exists()
+
+
+def test_parallel_sweep_matches_sequential_sweep() -> None:
+    rows = _sample_rows()
+    t0 = int(rows[0].ts)
+    markets = [
+        UpDownMarket("m5", t0 - 285, t0 + 74, "u5", "d5", 5),
+        UpDownMarket("m15", t0 - 885, t0 + 74, "u15", "d15", 15),
+    ]
+    grid = {
+        "watch_return_threshold": [0.001, 0.002],
+        "hammer_secs": [80, 100],
+        "d_min": [1.0],
+        "max_entry_price": [0.95, 0.99],
+        "fee_bps": [8.0],
+    }
+
+    assert sweep_parameter_grid(rows, markets, grid, workers=2) == sweep_parameter_grid(rows, markets, grid)
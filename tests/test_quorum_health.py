@@ -96,3 +96,13 @@ def test_no_flapping_near_divergence_threshold() -> None:
     blocked = q.evaluate(now=106.2)
     assert blocked.trading_allowed is False
     assert "SPOT_DIVERGENCE_SUSTAINED" in blocked.reason_codes
+
+
+def test_divergence_uses_median_of_fresh_spot_sources() -> None:
+    q = _build_quorum()
+    q.update_spot(feed="kraken", price=40000, payload_ts=100.0, received_ts=100.0)
+    q.update_spot(feed="binance", price=50100, payload_ts=100.0, received_ts=100.0)
+
+    decision = q.evaluate(now=101.0)
+
+    assert decision.divergence_pct == 0.0
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import orjson
+import pytest
+
+from ops.recorder import EventRecorder
+
+
+def test_recorder_writes_events_in_order_and_flushes_on_stop(tmp_path: Path) -> None:
+    output = tmp_path / "nested" / "events.jsonl"
+
+    async def _run() -> None:
+        recorder = EventRecorder(output, queue_maxsize=5_000)
+        await recorder.start()
+        for idx in range(1_200):
+            recorder.record("tick", ts=1.0, idx=idx)
+        await recorder.stop()
+
+    asyncio.run(_run())
+
+    rows = [orjson.loads(line) for line in output.read_bytes().splitlines()]
+    assert [row["idx"] for row in rows] == list(range(1_200))
+    assert rows[0] == {"type": "tick", "ts": 1.0, "idx": 0}
+
+
+def test_recorder_counts_dropped_events_when_queue_is_full(tmp_path: Path) -> None:
+    recorder = EventRecorder(tmp_path / "events.jsonl", queue_maxsize=2)
+
+    for idx in range(5):
+        recorder.record("tick", ts=1.0, idx=idx)
+
+    assert recorder._dropped_events == 3
+
+
+def test_recorder_disabled_ignores_events(tmp_path: Path) -> None:
+    output = tmp_path / "events.jsonl"
+
+    async def _run() -> None:
+        recorder = EventRecorder(output, enabled=False)
+        await recorder.start()
+        recorder.record("tick", ts=1.0)
+        await recorder.stop()
+
+    asyncio.run(_run())
+
+    assert not output.exists()
+
+
+def test_recorder_skips_unserializable_events_and_keeps_the_batch(tmp_path: Path) -> None:
+    output = tmp_path / "events.jsonl"
+
+    async def _run() -> None:
+        recorder = EventRecorder(output)
+        await recorder.start()
+        recorder.record("tick", ts=1.0, idx=0)
+        recorder.record("bad", ts=1.0, payload=object())
+        recorder.record("tick", ts=1.0, idx=1)
+        await recorder.stop()
+
+    asyncio.run(_run())
+
+    rows = [orjson.loads(line) for line in output.read_bytes().splitlines()]
+    assert [row["idx"] for row in rows] == [0, 1]
+
+
+def test_recorder_stop_reraises_writer_failure_without_hanging(tmp_path: Path) -> None:
+    output = tmp_path / "events.jsonl"
+    output.mkdir()
+
+    async def _run() -> None:
+        recorder = EventRecorder(output, queue_maxsize=2)
+        await recorder.start()
+        recorder._writer_thread.join(timeout=5)
+        recorder.record("tick", ts=1.0)
+        recorder.record("tick", ts=1.0)
+        with pytest.raises(RuntimeError, match="writer failed"):
+            await asyncio.wait_for(recorder.stop(), timeout=5)
+
+    asyncio.run(_run())
@@ -1,5 +1,8 @@
+import os
+import threading
+
 from markets.gamma_cache import UpDownMarket
-from strategy.replay_engine import ReplayEngine
+from strategy.replay_engine import ReplayEngine, load_recorded_events
 
 
 def _params() -> dict[str, float | int]:
@@ -48,3 +51,56 @@ def test_replay_engine_latency_impacts_fill_outcome() -> None:
     assert len(trades_slow) == 1
     assert trades_slow[0].ok is False
     assert summary_slow.fok_fail_pct == 1.0
+
+
+def test_load_recorded_events_skips_blank_and_non_object_lines(tmp_path) -> None:
+    path = tmp_path / "session.jsonl"
+    path.write_bytes(b'{"type": "rtds_price", "ts": 1.0}\n\n  \n[1, 2]\n{"type": "clob_book", "ts": 2.0}\n')
+
+    events = load_recorded_events(path)
+
+    assert events == [{"type": "rtds_price", "ts": 1.0}, {"type": "clob_book", "ts": 2.0}]
+
+
+def test_ingested_session_can_be_evaluated_with_different_params() -> None:
+    t0 = 1_710_000_000
+    markets = [UpDownMarket("m5", t0, t0 + 120, "u", "d", 5)]
+    events = [
+        {"type": "rtds_price", "ts": t0, "price": 50_000, "payload_ts": t0},
+        {"type": "rtds_price", "ts": t0 + 120, "price": 50_100, "payload_ts": t0 + 120},
+        {"type": "clob_book", "ts": t0 + 10, "token_id": "u", "asks_levels": [{"price": 0.45, "size": 100}]},
+        {"type": "decision", "ts": t0 + 10, "token_id": "u", "ask": 0.45, "fee_cost": 25.0, "notional": 20.0},
+    ]
+    engine = ReplayEngine(markets, order_latency_ms=0)
+    session = engine.ingest(events)
+
+    low_fee_trades, _ = engine.evaluate(session, _params())
+    high_fee_trades, _ = engine.evaluate(session, {**_params(), "fee_bps": 50.0})
+
+    assert low_fee_trades == engine.run(events, _params())[0]
+    assert low_fee_trades[0].fee_cost == 0.001
+    assert high_fee_trades[0].fee_cost == 0.005
+    assert len(session.fills) == 1
+
+
+def test_load_recorded_events_handles_empty_file(tmp_path) -> None:
+    path = tmp_path / "empty.jsonl"
+    path.write_bytes(b"")
+
+    assert load_recorded_events(path) == []
+
+
+def test_load_recorded_events_reads_from_a_pipe(tmp_path) -> None:
+    path = tmp_path / "events.fifo"
+    os.mkfifo(path)
+
+    def _feed() -> None:
+        with open(path, "wb") as writer:
+            writer.write(b'{"type":"tick","idx":0}\n\n{"type":"tick","idx":1}\n')
+
+    feeder = threading.Thread(target=_feed)
+    feeder.start()
+    events = load_recorded_events(path)
+    feeder.join()
+
+    assert [event["idx"] for event in events] == [0, 1]
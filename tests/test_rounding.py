@@ -39,3 +39,11 @@ def test_invalid_rounding_inputs() -> None:
         round_price_down_to_tick(1.0, -1)
     with pytest.raises(ValueError):
         round_size_to_step(1.0, -1)
+
+
+def test_on_grid_values_survive_float_division_error() -> None:
+    # 0.47 / 0.01 and 0.29 * 100 both land an ulp away from the integer grid index.
+    assert round_price_to_tick(0.47, 0.01) == 0.47
+    assert round_price_up_to_tick(0.29, 0.01) == 0.29
+    assert round_price_down_to_tick(0.059, 0.001) == 0.059
+    assert round_size_to_step(0.3, 0.1) == 0.3
@@ -220,3 +220,23 @@ def test_rolling_aggregates_match_legacy_deterministically() -> None:
                 assert agg_z == pytest.approx(legacy_z, rel=1e-12, abs=1e-12)
 
         assert sm._sigma1() == pytest.approx(_legacy_sigma1(rows), rel=1e-12, abs=1e-12)
+
+
+def test_rolling_aggregates_stay_exact_across_welford_resync() -> None:
+    sm = StrategyStateMachine(
+        0.5,
+        hammer_secs=15,
+        d_min=5,
+        max_entry_price=0.97,
+        fee_bps=10,
+        rolling_window_seconds=8,
+        watch_mode_expiry_seconds=9_999,
+    )
+
+    t0 = 1_710_000_000
+    for idx in range(1_200):
+        sm.on_price(t0 + idx, 50_000.0 + ((idx * 37) % 101) * 0.5)
+
+    rows = list(sm.prices_1s)
+    assert sm.sigma1_stats.removals < 1_024
+    assert sm._sigma1() == pytest.approx(_legacy_sigma1(rows), rel=1e-12, abs=1e-12)
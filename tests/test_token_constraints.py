@@ -165,3 +165,18 @@ def test_token_metadata_cache_put_many_persists_min_order_size() -> None:
     cache.put_many({"token-a": TokenMetadata(min_order_size=0.75)})
 
     assert cache.get_min_order_size("token-a") == 0.75
+
+
+def test_token_metadata_cache_expires_entries_after_ttl(monkeypatch) -> None:
+    now_ns = [1_000_000_000]
+    monkeypatch.setattr("markets.token_metadata_cache.time.monotonic_ns", lambda: now_ns[0])
+    cache = TokenMetadataCache(ttl_seconds=5.0)
+    metadata = TokenMetadata(tick_size=0.01)
+    cache.put("token-a", metadata)
+
+    now_ns[0] += 5_000_000_000
+    assert cache.get("token-a", allow_stale=False) is metadata
+
+    now_ns[0] += 1
+    assert cache.get("token-a", allow_stale=False) is None
+    assert cache.get("token-a", allow_stale=True) is metadata